@@ -0,0 +1,3 @@
+"""
+Configuration package for the LOB simulation.
+"""
@@ -4,12 +4,14 @@ Centralized configuration management for all simulation parameters.
 """
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, fields, replace
+from pathlib import Path
 from typing import Dict, Any, Optional
-import json
 
+import orjson
 
-@dataclass
+
+@dataclass(frozen=True)
 class SimulationConfig:
     """Configuration for simulation parameters."""
     initial_price: float = 100.0
@@ -20,7 +22,7 @@ class SimulationConfig:
     random_seed: Optional[int] = None
 
 
-@dataclass
+@dataclass(frozen=True)
 class AgentConfig:
     """Configuration for agent parameters."""
     informed_trader_lambda: float = 0.1
@@ -30,7 +32,7 @@ class AgentConfig:
     max_position: int = 1000
 
 
-@dataclass
+@dataclass(frozen=True)
 class OrderBookConfig:
     """Configuration for order book parameters."""
     max_levels: int = 10
@@ -40,7 +42,7 @@ class OrderBookConfig:
     cancellation_rate: float = 0.1
 
 
-@dataclass
+@dataclass(frozen=True)
 class StrategyConfig:
     """Configuration for trading strategies."""
     market_making_spread: float = 0.02
@@ -50,7 +52,7 @@ class StrategyConfig:
     risk_free_rate: float = 0.02
 
 
-@dataclass
+@dataclass(frozen=True)
 class WebConfig:
     """Configuration for web interface."""
     host: str = "localhost"
@@ -60,7 +62,7 @@ class WebConfig:
     websocket_ping_timeout: int = 10
 
 
-@dataclass
+@dataclass(frozen=True)
 class LoggingConfig:
     """Configuration for logging."""
     level: str = "INFO"
@@ -87,54 +89,42 @@ class ConfigManager:
     def load_from_file(self, config_file: str) -> None:
         """Load configuration from JSON file."""
         try:
-            with open(config_file, 'r') as f:
-                config_data = json.load(f)
+            config_data = orjson.loads(Path(config_file).read_bytes())
             
             # Update each config section
             for section, data in config_data.items():
                 if hasattr(self, section):
-                    section_config = getattr(self, section)
-                    for key, value in data.items():
-                        if hasattr(section_config, key):
-                            setattr(section_config, key, value)
+                    self.update_config(section, **data)
         except Exception as e:
             print(f"Warning: Could not load config file {config_file}: {e}")
     
     def save_to_file(self, config_file: str) -> None:
         """Save current configuration to JSON file."""
-        config_data = {
-            'simulation': self.simulation.__dict__,
-            'agent': self.agent.__dict__,
-            'orderbook': self.orderbook.__dict__,
-            'strategy': self.strategy.__dict__,
-            'web': self.web.__dict__,
-            'logging': self.logging.__dict__
-        }
-        
         try:
-            with open(config_file, 'w') as f:
-                json.dump(config_data, f, indent=2)
+            Path(config_file).write_bytes(orjson.dumps(self.get_all_config(), option=orjson.OPT_INDENT_2))
         except Exception as e:
             print(f"Error saving config file {config_file}: {e}")
     
     def get_all_config(self) -> Dict[str, Any]:
         """Get all configuration as a dictionary."""
         return {
-            'simulation': self.simulation.__dict__,
-            'agent': self.agent.__dict__,
-            'orderbook': self.orderbook.__dict__,
-            'strategy': self.strategy.__dict__,
-            'web': self.web.__dict__,
-            'logging': self.logging.__dict__
+            'simulation': asdict(self.simulation),
+            'agent': asdict(self.agent),
+            'orderbook': asdict(self.orderbook),
+            'strategy': asdict(self.strategy),
+            'web': asdict(self.web),
+            'logging': asdict(self.logging)
         }
     
     def update_config(self, section: str, **kwargs) -> None:
         """Update configuration for a specific section."""
         if hasattr(self, section):
+            # Sections are frozen, so swap in an updated copy; unknown keys are ignored
             section_config = getattr(self, section)
-            for key, value in kwargs.items():
-                if hasattr(section_config, key):
-                    setattr(section_config, key, value)
+            known = {f.name for f in fields(section_config)}
+            changes = {key: value for key, value in kwargs.items() if key in known}
+            if changes:
+                setattr(self, section, replace(section_config, **changes))
 
 
 # Global configuration instance
@@ -148,33 +138,41 @@ def get_config() -> ConfigManager:
 
 def load_config_from_env() -> None:
     """Load configuration from environment variables."""
+    simulation_config = {}
+    web_config = {}
+    logging_config = {}
+    
     # Simulation config
     initial_price = os.getenv('LOB_INITIAL_PRICE')
     if initial_price:
-        config.simulation.initial_price = float(initial_price)
+        simulation_config['initial_price'] = float(initial_price)
     
     simulation_duration = os.getenv('LOB_SIMULATION_DURATION')
     if simulation_duration:
-        config.simulation.simulation_duration = float(simulation_duration)
+        simulation_config['simulation_duration'] = float(simulation_duration)
     
     # Web config
     host = os.getenv('LOB_HOST')
     if host:
-        config.web.host = host
+        web_config['host'] = host
     
     port = os.getenv('LOB_PORT')
     if port:
-        config.web.port = int(port)
+        web_config['port'] = int(port)
     
     debug = os.getenv('LOB_DEBUG')
     if debug:
-        config.web.debug = debug.lower() == 'true'
+        web_config['debug'] = debug.lower() == 'true'
     
     # Logging config
     log_level = os.getenv('LOB_LOG_LEVEL')
     if log_level:
-        config.logging.level = log_level
+        logging_config['level'] = log_level
     
     log_file = os.getenv('LOB_LOG_FILE')
     if log_file:
-        config.logging.file = log_file 
\ No newline at end of file
+        logging_config['file'] = log_file
+    
+    config.update_config('simulation', **simulation_config)
+    config.update_config('web', **web_config)
+    config.update_config('logging', **logging_config)
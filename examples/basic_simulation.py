@@ -5,10 +5,6 @@ This example demonstrates the core functionality of the LOB simulation
 with a simple configuration and basic analysis.
 """
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from lob_simulation import LimitOrderBookSimulation, SimulationConfig
 import matplotlib.pyplot as plt
 import pandas as pd
@@ -80,7 +76,7 @@ def analyze_results(results):
     volume_df = pd.DataFrame(results['volume_history'])
     
     if len(results['trades']) > 0:
-        trades_df = pd.DataFrame([trade.__dict__ for trade in results['trades']])
+        trades_df = results['trades'].to_frame()
     else:
         trades_df = pd.DataFrame()
     
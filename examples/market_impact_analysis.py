@@ -7,15 +7,32 @@ This example demonstrates market impact analysis, including:
 - Impact decay analysis
 """
 
+import io
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import numpy as np
 import pandas as pd
+import matplotlib
+
+# Render off-screen when the figures are only written to files
+SHOW_PLOTS = '--no-show' not in sys.argv
+if not SHOW_PLOTS:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-from scipy import stats
-from sklearn.linear_model import LinearRegression
+
+# Set LOB_WRITE_FIGS=0 to keep rendered figures in memory only
+WRITE_FIGURES = os.environ.get('LOB_WRITE_FIGS', '1') != '0'
+
+
+def save_figure(fig, filename):
+    """Render a figure to an in-memory PNG, also writing it to ``filename`` if enabled."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=120)
+    if WRITE_FIGURES:
+        with open(filename, 'wb') as f:
+            f.write(buffer.getbuffer())
+    return buffer
 
 
 def simulate_market_impact():
@@ -25,11 +42,12 @@ def simulate_market_impact():
     print("=" * 50)
     
     # Generate synthetic trade data with known impact
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
+    num_trades = 1000
     
     # Trade sizes (in shares)
-    trade_sizes = np.random.lognormal(mean=5, sigma=1, size=1000)
-    trade_sizes = np.round(trade_sizes).astype(int)
+    trade_sizes = rng.lognormal(mean=5, sigma=1, size=num_trades)
+    trade_sizes = np.round(trade_sizes).astype(np.int32)
     
     # Base price
     base_price = 100.0
@@ -39,32 +57,28 @@ def simulate_market_impact():
     perm_impact_coef = 0.0005  # Permanent impact coefficient
     decay_rate = 0.1  # Impact decay rate
     
-    # Generate trades with impact
-    trades = []
-    current_price = base_price
-    
-    for i, size in enumerate(trade_sizes):
-        # Calculate impact
-        temp_impact = temp_impact_coef * np.sign(np.random.randn()) * size**0.5
-        perm_impact = perm_impact_coef * np.sign(np.random.randn()) * size**0.5
-        
-        # Apply impact
-        trade_price = current_price + temp_impact
-        current_price += perm_impact
-        
-        # Add some noise
-        trade_price += np.random.normal(0, 0.01)
-        
-        trades.append({
-            'trade_id': f'trade_{i}',
-            'size': size,
-            'price': trade_price,
-            'temp_impact': temp_impact,
-            'perm_impact': perm_impact,
-            'timestamp': i
-        })
-    
-    return pd.DataFrame(trades)
+    # Calculate impact for all trades at once; float32 is ample for this synthetic data
+    sqrt_sizes = np.sqrt(trade_sizes, dtype=np.float32)
+    temp_impact = temp_impact_coef * np.sign(rng.standard_normal(num_trades, dtype=np.float32)) * sqrt_sizes
+    perm_impact = perm_impact_coef * np.sign(rng.standard_normal(num_trades, dtype=np.float32)) * sqrt_sizes
+    
+    # Each trade executes at the price left by the permanent impact of earlier trades
+    current_price = base_price + np.concatenate((np.zeros(1, dtype=np.float32), np.cumsum(perm_impact[:-1])))
+    
+    # Apply temporary impact and add some noise
+    trade_price = current_price + temp_impact + 0.01 * rng.standard_normal(num_trades, dtype=np.float32)
+    
+    return pd.DataFrame({
+        'trade_id': np.char.add('trade_', np.arange(num_trades).astype(str)),
+        'size': trade_sizes,
+        'price': trade_price,
+        'temp_impact': temp_impact,
+        'perm_impact': perm_impact,
+        'timestamp': np.arange(num_trades),
+        # Derived columns shared by the analyses below
+        'abs_impact': np.abs(trade_price - base_price),
+        'total_impact': temp_impact + perm_impact
+    })
 
 
 def analyze_square_root_law(trades_df):
@@ -73,28 +87,27 @@ def analyze_square_root_law(trades_df):
     print("Square-Root Law Analysis")
     print("-" * 30)
     
-    # Calculate absolute price changes
-    trades_df['abs_impact'] = np.abs(trades_df['price'] - 100.0)
-    
-    # Fit square-root law: |Δp| = α * Q^β
-    log_sizes = np.log(trades_df['size'])
-    log_impacts = np.log(trades_df['abs_impact'] + 1e-10)
+    # Fit square-root law: |Δp| = α * Q^β (logs are kept for the visualizations)
+    trades_df['log_size'] = np.log(trades_df['size'])
+    trades_df['log_abs_impact'] = np.log(trades_df['abs_impact'] + 1e-10)
     
-    # Linear regression
-    X = log_sizes.reshape(-1, 1)
-    y = log_impacts
+    # Linear regression (closed-form least squares on the log-log data)
+    x = trades_df['log_size'].to_numpy()
+    y = trades_df['log_abs_impact'].to_numpy()
     
-    model = LinearRegression()
-    model.fit(X, y)
+    # full=True also returns the residual sum of squares from the same solve
+    (beta, log_alpha), (ss_res,), *_ = np.polyfit(x, y, 1, full=True)
+    model = np.poly1d((beta, log_alpha))
+    alpha = np.exp(log_alpha)
     
-    alpha = np.exp(model.intercept_)
-    beta = model.coef_[0]
+    ss_tot = ((y - y.mean()) ** 2).sum()
+    r_squared = 1 - ss_res / ss_tot
     
     print(f"Square-root law parameters:")
     print(f"  α (coefficient): {alpha:.6f}")
     print(f"  β (exponent): {beta:.3f}")
     print(f"  Theoretical β: 0.5")
-    print(f"  R²: {model.score(X, y):.3f}")
+    print(f"  R²: {r_squared:.3f}")
     print()
     
     return alpha, beta, model
@@ -106,64 +119,79 @@ def analyze_impact_decay(trades_df):
     print("Impact Decay Analysis")
     print("-" * 30)
     
-    # Group trades by size and analyze decay
-    size_groups = trades_df.groupby(pd.cut(trades_df['size'], bins=5))
-    
-    decay_analysis = []
-    
-    for size_bin, group in size_groups:
-        if len(group) < 10:
-            continue
-        
-        # Calculate average impact over time
-        group = group.sort_values('timestamp')
-        group['cumulative_impact'] = group['temp_impact'].cumsum()
-        
-        # Fit exponential decay
-        times = group['timestamp'].values
-        impacts = group['cumulative_impact'].values
-        
-        if len(impacts) > 1:
-            try:
-                # Fit exponential decay: I(t) = I₀ * e^(-λt)
-                log_impacts = np.log(np.abs(impacts) + 1e-10)
-                slope, intercept, r_value, p_value, std_err = stats.linregress(times, log_impacts)
-                
-                decay_rate = -slope
-                decay_analysis.append({
-                    'size_bin': size_bin,
-                    'decay_rate': decay_rate,
-                    'r_squared': r_value**2,
-                    'avg_size': group['size'].mean()
-                })
-            except:
-                continue
-    
-    decay_df = pd.DataFrame(decay_analysis)
-    
-    if len(decay_df) > 0:
+    # Assign size bins and order trades by (bin, timestamp)
+    size_bins = pd.cut(trades_df['size'], bins=5)
+    codes = size_bins.cat.codes.to_numpy()
+    order = np.lexsort((trades_df['timestamp'].to_numpy(), codes))
+    codes = codes[order]
+    times = trades_df['timestamp'].to_numpy(dtype=float)[order]
+    temp_impact = trades_df['temp_impact'].to_numpy()[order]
+    sizes = trades_df['size'].to_numpy(dtype=float)[order]
+    
+    # Each bin is now a contiguous segment
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, len(codes)])
+    
+    # Cumulative impact within each bin
+    cumulative = np.cumsum(temp_impact)
+    offsets = np.r_[0.0, cumulative[starts[1:] - 1]]
+    cumulative_impact = cumulative - np.repeat(offsets, counts)
+    
+    # Fit exponential decay I(t) = I₀ * e^(-λt) per bin with closed-form OLS on log|I|
+    log_impacts = np.log(np.abs(cumulative_impact) + 1e-10)
+    sum_t = np.add.reduceat(times, starts)
+    sum_y = np.add.reduceat(log_impacts, starts)
+    sum_tt = np.add.reduceat(times * times, starts)
+    sum_ty = np.add.reduceat(times * log_impacts, starts)
+    sum_yy = np.add.reduceat(log_impacts * log_impacts, starts)
+    
+    cov_ty = counts * sum_ty - sum_t * sum_y
+    var_t = counts * sum_tt - sum_t * sum_t
+    var_y = counts * sum_yy - sum_y * sum_y
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = cov_ty / var_t
+        r_squared = cov_ty * cov_ty / (var_t * var_y)
+    
+    avg_size = np.add.reduceat(sizes, starts) / counts
+    
+    # Skip bins with too few trades for a meaningful fit
+    valid = counts >= 10
+    decay_analysis = {
+        'size_bin': size_bins.cat.categories[codes[starts[valid]]],
+        'decay_rate': -slope[valid],
+        'r_squared': r_squared[valid],
+        'avg_size': avg_size[valid]
+    }
+    
+    if len(decay_analysis['decay_rate']) > 0:
         print("Impact decay rates by trade size:")
-        for _, row in decay_df.iterrows():
-            print(f"  Size {row['size_bin']}: λ = {row['decay_rate']:.3f} (R² = {row['r_squared']:.3f})")
+        for size_bin, decay_rate, r_squared in zip(decay_analysis['size_bin'], decay_analysis['decay_rate'],
+                                                   decay_analysis['r_squared']):
+            print(f"  Size {size_bin}: λ = {decay_rate:.3f} (R² = {r_squared:.3f})")
         print()
     
-    return decay_df
+    return decay_analysis
 
 
-def create_impact_visualizations(trades_df, alpha, beta, decay_df):
+def create_impact_visualizations(trades_df, alpha, beta, model, decay_analysis):
     """Create visualizations for market impact analysis."""
     
     print("Creating Impact Analysis Visualizations...")
     print("=" * 50)
     
+    # Pull each column out once and share it across the subplots
+    sizes = trades_df['size'].to_numpy()
+    abs_impact = trades_df['abs_impact'].to_numpy()
+    min_size, max_size = sizes.min(), sizes.max()
+    
     fig, axes = plt.subplots(2, 2, figsize=(15, 10))
     fig.suptitle('Market Impact Analysis', fontsize=16)
     
     # 1. Square-root law validation
-    axes[0, 0].scatter(trades_df['size'], trades_df['abs_impact'], alpha=0.6, s=20)
+    axes[0, 0].scatter(sizes, abs_impact, alpha=0.6, s=20)
     
     # Plot fitted curve
-    size_range = np.linspace(trades_df['size'].min(), trades_df['size'].max(), 100)
+    size_range = np.linspace(min_size, max_size, 100)
     fitted_impact = alpha * size_range**beta
     axes[0, 0].plot(size_range, fitted_impact, 'r-', linewidth=2, label=f'Fitted: α={alpha:.6f}, β={beta:.3f}')
     
@@ -176,15 +204,11 @@ def create_impact_visualizations(trades_df, alpha, beta, decay_df):
     axes[0, 0].grid(True, alpha=0.3)
     
     # 2. Impact vs. Size (log-log)
-    axes[0, 1].scatter(np.log(trades_df['size']), np.log(trades_df['abs_impact']), alpha=0.6, s=20)
-    
-    # Plot fitted line
-    log_sizes = np.log(trades_df['size'])
-    log_impacts = np.log(trades_df['abs_impact'] + 1e-10)
-    model = LinearRegression()
-    model.fit(log_sizes.reshape(-1, 1), log_impacts)
-    log_size_range = np.linspace(log_sizes.min(), log_sizes.max(), 100)
-    fitted_log_impact = model.predict(log_size_range.reshape(-1, 1))
+    axes[0, 1].scatter(trades_df['log_size'].to_numpy(), trades_df['log_abs_impact'].to_numpy(), alpha=0.6, s=20)
+    
+    # Plot fitted line from the square-root law model
+    log_size_range = np.linspace(np.log(min_size), np.log(max_size), 100)
+    fitted_log_impact = model(log_size_range)
     axes[0, 1].plot(log_size_range, fitted_log_impact, 'r-', linewidth=2)
     
     axes[0, 1].set_xlabel('Log(Trade Size)')
@@ -193,26 +217,31 @@ def create_impact_visualizations(trades_df, alpha, beta, decay_df):
     axes[0, 1].grid(True, alpha=0.3)
     
     # 3. Impact distribution
-    axes[1, 0].hist(trades_df['abs_impact'], bins=30, alpha=0.7, color='green')
+    axes[1, 0].hist(abs_impact, bins=30, alpha=0.7, color='green')
     axes[1, 0].set_xlabel('Absolute Price Impact')
     axes[1, 0].set_ylabel('Frequency')
     axes[1, 0].set_title('Impact Distribution')
     axes[1, 0].grid(True, alpha=0.3)
     
     # 4. Decay rates by size
-    if len(decay_df) > 0:
-        axes[1, 1].scatter(decay_df['avg_size'], decay_df['decay_rate'], s=100, alpha=0.7)
+    if len(decay_analysis['decay_rate']) > 0:
+        axes[1, 1].scatter(decay_analysis['avg_size'], decay_analysis['decay_rate'], s=100, alpha=0.7)
         axes[1, 1].set_xlabel('Average Trade Size')
         axes[1, 1].set_ylabel('Decay Rate (λ)')
         axes[1, 1].set_title('Impact Decay by Trade Size')
         axes[1, 1].grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('market_impact_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    buffer = save_figure(fig, 'market_impact_analysis.png')
+    if SHOW_PLOTS:
+        plt.show()
+    plt.close(fig)
     
-    print("Visualization saved as 'market_impact_analysis.png'")
+    if WRITE_FIGURES:
+        print("Visualization saved as 'market_impact_analysis.png'")
     print()
+    
+    return buffer
 
 
 def analyze_temporary_vs_permanent_impact(trades_df):
@@ -221,9 +250,6 @@ def analyze_temporary_vs_permanent_impact(trades_df):
     print("Temporary vs. Permanent Impact Analysis")
     print("-" * 40)
     
-    # Calculate impact components
-    trades_df['total_impact'] = trades_df['temp_impact'] + trades_df['perm_impact']
-    
     # Statistics
     temp_impact_mean = trades_df['temp_impact'].mean()
     perm_impact_mean = trades_df['perm_impact'].mean()
@@ -258,30 +284,40 @@ def analyze_temporary_vs_permanent_impact(trades_df):
     ax1.plot(impact_range, impact_range, 'r--', alpha=0.5, label='y=x')
     ax1.legend()
     
-    # Impact components by trade size
-    size_bins = pd.cut(trades_df['size'], bins=5)
-    impact_by_size = trades_df.groupby(size_bins)[['temp_impact', 'perm_impact']].mean()
+    # Impact components by trade size (5 equal-width, right-closed bins)
+    sizes = trades_df['size'].to_numpy()
+    edges = np.linspace(sizes.min(), sizes.max(), 6)
+    bin_ids = np.digitize(sizes, edges[1:-1], right=True)
+    counts = np.bincount(bin_ids, minlength=5)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_temp = np.bincount(bin_ids, weights=trades_df['temp_impact'].to_numpy(), minlength=5) / counts
+        mean_perm = np.bincount(bin_ids, weights=trades_df['perm_impact'].to_numpy(), minlength=5) / counts
     
-    x_pos = np.arange(len(impact_by_size))
+    x_pos = np.arange(len(counts))
     width = 0.35
     
-    ax2.bar(x_pos - width/2, impact_by_size['temp_impact'], width, label='Temporary', alpha=0.7)
-    ax2.bar(x_pos + width/2, impact_by_size['perm_impact'], width, label='Permanent', alpha=0.7)
+    ax2.bar(x_pos - width/2, mean_temp, width, label='Temporary', alpha=0.7)
+    ax2.bar(x_pos + width/2, mean_perm, width, label='Permanent', alpha=0.7)
     
     ax2.set_xlabel('Trade Size Bins')
     ax2.set_ylabel('Average Impact')
     ax2.set_title('Impact Components by Trade Size')
     ax2.set_xticks(x_pos)
-    ax2.set_xticklabels([str(bin) for bin in impact_by_size.index], rotation=45)
+    ax2.set_xticklabels([f'({lo:.1f}, {hi:.1f}]' for lo, hi in zip(edges[:-1], edges[1:])], rotation=45)
     ax2.legend()
     ax2.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('impact_components_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    buffer = save_figure(fig, 'impact_components_analysis.png')
+    if SHOW_PLOTS:
+        plt.show()
+    plt.close(fig)
     
-    print("Impact components visualization saved as 'impact_components_analysis.png'")
+    if WRITE_FIGURES:
+        print("Impact components visualization saved as 'impact_components_analysis.png'")
     print()
+    
+    return buffer
 
 
 def main():
@@ -298,18 +334,19 @@ def main():
     alpha, beta, model = analyze_square_root_law(trades_df)
     
     # Analyze impact decay
-    decay_df = analyze_impact_decay(trades_df)
+    decay_analysis = analyze_impact_decay(trades_df)
     
     # Create visualizations
-    create_impact_visualizations(trades_df, alpha, beta, decay_df)
+    create_impact_visualizations(trades_df, alpha, beta, model, decay_analysis)
     
     # Analyze temporary vs permanent impact
     analyze_temporary_vs_permanent_impact(trades_df)
     
     print("Market impact analysis completed!")
-    print("Check the generated files:")
-    print("  - market_impact_analysis.png")
-    print("  - impact_components_analysis.png")
+    if WRITE_FIGURES:
+        print("Check the generated files:")
+        print("  - market_impact_analysis.png")
+        print("  - impact_components_analysis.png")
 
 
 if __name__ == "__main__":
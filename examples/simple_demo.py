@@ -6,10 +6,6 @@ This script demonstrates the basic usage of the LOB simulation
 with a minimal configuration and simple analysis.
 """
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from lob_simulation import LimitOrderBookSimulation, SimulationConfig
 
 
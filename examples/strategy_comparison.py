@@ -6,14 +6,21 @@ This script demonstrates different trading strategies and compares their PnL per
 in the LOB simulation environment.
 """
 
+import io
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import numpy as np
-import pandas as pd
+import matplotlib
+
+# Render off-screen when the figures are only written to files
+SHOW_PLOTS = '--no-show' not in sys.argv
+if not SHOW_PLOTS:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import seaborn as sns
+
+# Set LOB_WRITE_FIGS=0 to keep rendered figures in memory only
+WRITE_FIGURES = os.environ.get('LOB_WRITE_FIGS', '1') != '0'
 from datetime import datetime
 
 from lob_simulation import (
@@ -22,6 +29,21 @@ from lob_simulation import (
 )
 
 
+# Metrics compared across strategies in the performance plots
+PERFORMANCE_METRICS = ('total_pnl', 'win_rate', 'sharpe_ratio', 'max_drawdown',
+                       'num_trades', 'realized_pnl', 'unrealized_pnl')
+
+
+def save_figure(fig, filename):
+    """Render a figure to an in-memory PNG, also writing it to ``filename`` if enabled."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=120)
+    if WRITE_FIGURES:
+        with open(filename, 'wb') as f:
+            f.write(buffer.getbuffer())
+    return buffer
+
+
 def run_strategy_comparison():
     """Run comparison of different trading strategies."""
     
@@ -109,7 +131,6 @@ def run_strategy_comparison():
     print(f"{'Strategy':<15} {'Total PnL':<12} {'Win Rate':<10} {'Sharpe':<8} {'Max DD':<8} {'Trades':<8}")
     print("-" * 70)
     
-    performance_data = []
     for strategy_name, perf in strategy_performance.items():
         print(f"{strategy_name:<15} "
               f"${perf['total_pnl']:<11.2f} "
@@ -117,17 +138,11 @@ def run_strategy_comparison():
               f"{perf['sharpe_ratio']:<8.2f} "
               f"{perf['max_drawdown']:<8.2%} "
               f"{perf['num_trades']:<8}")
-        
-        performance_data.append({
-            'strategy': strategy_name,
-            'total_pnl': perf['total_pnl'],
-            'win_rate': perf['win_rate'],
-            'sharpe_ratio': perf['sharpe_ratio'],
-            'max_drawdown': perf['max_drawdown'],
-            'num_trades': perf['num_trades'],
-            'realized_pnl': perf['realized_pnl'],
-            'unrealized_pnl': perf['unrealized_pnl']
-        })
+    
+    # One array per metric, in strategy order
+    performance_data = {'strategy': np.asarray(list(strategy_performance))}
+    for metric in PERFORMANCE_METRICS:
+        performance_data[metric] = np.asarray([perf[metric] for perf in strategy_performance.values()])
     
     # Create visualizations
     create_performance_plots(performance_data, results)
@@ -135,11 +150,8 @@ def run_strategy_comparison():
     return strategy_performance, results
 
 
-def create_performance_plots(performance_data, simulation_results):
-    """Create performance comparison plots."""
-    
-    # Convert to DataFrame
-    df = pd.DataFrame(performance_data)
+def create_performance_plots(data, simulation_results):
+    """Create performance comparison plots from per-metric arrays."""
     
     # Set up the plotting style
     plt.style.use('seaborn-v0_8')
@@ -148,7 +160,7 @@ def create_performance_plots(performance_data, simulation_results):
     
     # 1. Total PnL Comparison
     ax1 = axes[0, 0]
-    bars = ax1.bar(df['strategy'], df['total_pnl'], 
+    bars = ax1.bar(data['strategy'], data['total_pnl'], 
                    color=['#2E86AB', '#A23B72', '#F18F01', '#C73E1D'])
     ax1.set_title('Total PnL by Strategy', fontweight='bold')
     ax1.set_ylabel('PnL ($)')
@@ -162,8 +174,8 @@ def create_performance_plots(performance_data, simulation_results):
     
     # 2. Risk-Return Scatter Plot
     ax2 = axes[0, 1]
-    scatter = ax2.scatter(df['max_drawdown'], df['total_pnl'], 
-                         s=df['num_trades']*2, c=df['sharpe_ratio'], 
+    scatter = ax2.scatter(data['max_drawdown'], data['total_pnl'], 
+                         s=data['num_trades']*2, c=data['sharpe_ratio'], 
                          cmap='RdYlGn', alpha=0.7)
     ax2.set_xlabel('Maximum Drawdown')
     ax2.set_ylabel('Total PnL ($)')
@@ -171,8 +183,8 @@ def create_performance_plots(performance_data, simulation_results):
     ax2.grid(True, alpha=0.3)
     
     # Add strategy labels
-    for i, strategy in enumerate(df['strategy']):
-        ax2.annotate(strategy, (df['max_drawdown'].iloc[i], df['total_pnl'].iloc[i]),
+    for strategy, drawdown, pnl in zip(data['strategy'], data['max_drawdown'], data['total_pnl']):
+        ax2.annotate(strategy, (drawdown, pnl),
                     xytext=(5, 5), textcoords='offset points', fontsize=9)
     
     # Add colorbar
@@ -181,7 +193,7 @@ def create_performance_plots(performance_data, simulation_results):
     
     # 3. Win Rate vs Number of Trades
     ax3 = axes[1, 0]
-    bars = ax3.bar(df['strategy'], df['win_rate'], 
+    bars = ax3.bar(data['strategy'], data['win_rate'], 
                    color=['#2E86AB', '#A23B72', '#F18F01', '#C73E1D'])
     ax3.set_title('Win Rate by Strategy', fontweight='bold')
     ax3.set_ylabel('Win Rate')
@@ -196,19 +208,19 @@ def create_performance_plots(performance_data, simulation_results):
     
     # 4. PnL Components (Realized vs Unrealized)
     ax4 = axes[1, 1]
-    x = np.arange(len(df))
+    x = np.arange(len(data['strategy']))
     width = 0.35
     
-    bars1 = ax4.bar(x - width/2, df['realized_pnl'], width, 
+    bars1 = ax4.bar(x - width/2, data['realized_pnl'], width, 
                     label='Realized PnL', color='#2E86AB', alpha=0.8)
-    bars2 = ax4.bar(x + width/2, df['unrealized_pnl'], width, 
+    bars2 = ax4.bar(x + width/2, data['unrealized_pnl'], width, 
                     label='Unrealized PnL', color='#A23B72', alpha=0.8)
     
     ax4.set_xlabel('Strategy')
     ax4.set_ylabel('PnL ($)')
     ax4.set_title('PnL Components', fontweight='bold')
     ax4.set_xticks(x)
-    ax4.set_xticklabels(df['strategy'])
+    ax4.set_xticklabels(data['strategy'])
     ax4.legend()
     ax4.grid(True, alpha=0.3)
     
@@ -225,11 +237,16 @@ def create_performance_plots(performance_data, simulation_results):
     # Save the plot
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"strategy_comparison_{timestamp}.png"
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
-    print(f"\nPerformance plots saved as: {filename}")
+    buffer = save_figure(fig, filename)
+    if WRITE_FIGURES:
+        print(f"\nPerformance plots saved as: {filename}")
     
     # Show the plot
-    plt.show()
+    if SHOW_PLOTS:
+        plt.show()
+    plt.close(fig)
+    
+    return buffer
 
 
 def create_pnl_timeline_plot(simulation_results):
@@ -239,7 +256,7 @@ def create_pnl_timeline_plot(simulation_results):
     # This would require modifying the simulation to track PnL over time
     # For now, we'll create a simple example
     
-    plt.figure(figsize=(12, 8))
+    fig = plt.figure(figsize=(12, 8))
     
     # Simulate PnL timeline (in a real implementation, this would come from the simulation)
     time_points = np.linspace(0, 300, 100)
@@ -247,23 +264,31 @@ def create_pnl_timeline_plot(simulation_results):
     strategies = ['market_making', 'momentum', 'mean_reversion', 'arbitrage']
     colors = ['#2E86AB', '#A23B72', '#F18F01', '#C73E1D']
     
+    # Simulate all PnL paths in one draw (replace with actual data from simulation)
+    rng = np.random.default_rng()
+    pnl_paths = 0.5 * rng.standard_normal((len(strategies), len(time_points))).cumsum(axis=1)
+    
     for i, strategy in enumerate(strategies):
-        # Simulate PnL path (replace with actual data from simulation)
-        pnl_path = np.cumsum(np.random.normal(0, 0.5, len(time_points)))
-        plt.plot(time_points, pnl_path, label=strategy, color=colors[i], linewidth=2)
+        plt.plot(time_points, pnl_paths[i], label=strategy, color=colors[i], linewidth=2)
     
     plt.xlabel('Time (seconds)')
     plt.ylabel('Cumulative PnL ($)')
     plt.title('Strategy PnL Timeline', fontweight='bold')
     plt.legend()
     plt.grid(True, alpha=0.3)
+    plt.tight_layout()
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"pnl_timeline_{timestamp}.png"
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
-    print(f"PnL timeline saved as: {filename}")
+    buffer = save_figure(fig, filename)
+    if WRITE_FIGURES:
+        print(f"PnL timeline saved as: {filename}")
+    
+    if SHOW_PLOTS:
+        plt.show()
+    plt.close(fig)
     
-    plt.show()
+    return buffer
 
 
 if __name__ == "__main__":
@@ -10,7 +10,7 @@ __version__ = "1.0.0"
 __author__ = "Limit Order Book Simulation Team"
 __email__ = "contact@lob-simulation.com"
 
-from .core.simulation import LimitOrderBookSimulation, SimulationConfig
+from .core.simulation import LimitOrderBookSimulation, SimulationConfig, SimulationResults
 from .orderbook import OrderBook
 from .agents import InformedTrader, UninformedTrader, MarketMaker
 from .events import OrderEvent, CancelEvent, TradeEvent
@@ -24,6 +24,7 @@ from .strategies import (
 __all__ = [
     "LimitOrderBookSimulation",
     "SimulationConfig",
+    "SimulationResults",
     "OrderBook",
     "InformedTrader",
     "UninformedTrader", 
@@ -5,6 +5,7 @@ This module provides the abstract base class and common functionality
 for all market agents.
 """
 
+import random
 import numpy as np
 from typing import Optional, Dict, Any
 from abc import ABC, abstractmethod
@@ -12,16 +13,54 @@ from abc import ABC, abstractmethod
 from ..events import OrderEvent, CancelEvent, Event
 
 
+# Order sides and types shared by all agents (the values the order book expects)
+BUY, SELL = 'buy', 'sell'
+LIMIT, MARKET = 'limit', 'market'
+
+# Number of inter-arrival times drawn per refill of an agent's buffer
+EXP_BUFFER_SIZE = 4096
+
+
 class BaseAgent(ABC):
     """Base class for all market participants."""
     
-    def __init__(self, trader_id: str, arrival_rate: float):
+    __slots__ = ('trader_id', 'arrival_rate', '_inv_rate', 'inventory', 'cash', 'pnl',
+                 '_order_prefix', '_order_counter', '_rng', '_random', '_exp_buf', '_exp_idx')
+    
+    def __init__(self, trader_id: str, arrival_rate: float, seed: Optional[int] = None):
         self.trader_id = trader_id
         self.arrival_rate = arrival_rate
-        self.active_orders = {}  # order_id -> order details
+        self._inv_rate = 1.0 / arrival_rate  # mean inter-arrival time
         self.inventory = 0
         self.cash = 100000.0  # Starting cash
         self.pnl = 0.0
+        
+        # Order ids are unique per agent: a cached prefix plus a running counter
+        self._order_prefix = f"{trader_id}_order_"
+        self._order_counter = 0
+        
+        # Per-agent random streams: a numpy Generator for batched draws and a
+        # stdlib generator (seeded from it) for cheap scalar draws
+        self._rng = np.random.default_rng(seed)
+        self._random = random.Random(int(self._rng.integers(2**63)))
+        
+        # Inter-arrival times are drawn in batches and filled on first use
+        self._exp_buf = []
+        self._exp_idx = 0
+    
+    def _next_order_id(self) -> str:
+        """Get a new order id that is never reused by this agent."""
+        self._order_counter += 1
+        return self._order_prefix + str(self._order_counter)
+    
+    def _next_interarrival(self) -> float:
+        """Get the next exponential inter-arrival time from the cached buffer."""
+        if self._exp_idx == len(self._exp_buf):
+            self._exp_buf = self._rng.exponential(self._inv_rate, EXP_BUFFER_SIZE).tolist()
+            self._exp_idx = 0
+        value = self._exp_buf[self._exp_idx]
+        self._exp_idx += 1
+        return value
     
     @abstractmethod
     def get_next_event(self, current_time: float) -> Optional[Event]:
@@ -33,14 +72,35 @@ class BaseAgent(ABC):
         """Process market data updates."""
         pass
     
+    def order_closed(self, order_id: str):
+        """Forget an order that was fully filled or cancelled."""
+        pass
+    
     def update_pnl(self, trade_price: float, trade_quantity: int, side: str):
         """Update P&L based on trade."""
-        if side == 'buy':
-            self.inventory += trade_quantity
-            self.cash -= trade_price * trade_quantity
-        else:
-            self.inventory -= trade_quantity
-            self.cash += trade_price * trade_quantity
+        signed_quantity = trade_quantity if side == BUY else -trade_quantity
+        self.inventory += signed_quantity
+        self.cash -= trade_price * signed_quantity
         
         # Calculate unrealized P&L (simplified)
-        self.pnl = self.cash + self.inventory * trade_price - 100000.0 
\ No newline at end of file
+        self.pnl = self.cash + self.inventory * trade_price - 100000.0
+    
+    def update_pnl_batch(self, trade_prices, trade_quantities, sides):
+        """
+        Update P&L for a batch of trades in one pass.
+        
+        Equivalent to calling ``update_pnl`` for each trade in order: the
+        unrealized P&L is marked at the last trade price.
+        """
+        if not trade_prices:
+            return
+        inventory_delta = 0
+        cash_delta = 0.0
+        for price, quantity, side in zip(trade_prices, trade_quantities, sides):
+            signed_quantity = quantity if side == BUY else -quantity
+            inventory_delta += signed_quantity
+            cash_delta += price * signed_quantity
+        
+        self.inventory += inventory_delta
+        self.cash -= cash_delta
+        self.pnl = self.cash + self.inventory * trade_prices[-1] - 100000.0
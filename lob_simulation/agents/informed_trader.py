@@ -4,10 +4,8 @@ Informed Trader Agent
 An informed trader with private information that follows Poisson process.
 """
 
-import numpy as np
-import random
 from typing import Optional, Dict, Any
-from .base import BaseAgent
+from .base import BaseAgent, BUY, SELL, LIMIT, MARKET
 from ..events import OrderEvent, Event
 
 
@@ -19,18 +17,30 @@ class InformedTrader(BaseAgent):
     When informed, trader has better price prediction.
     """
     
-    def __init__(self, trader_id: str, arrival_rate: float, private_info_prob: float = 0.1):
-        super().__init__(trader_id, arrival_rate)
+    __slots__ = ('private_info_prob', 'has_private_info', 'private_info_direction',
+                 'private_info_strength', 'last_event_time', '_choose_price')
+    
+    # Probability of sending a market rather than a limit order
+    MARKET_PROB_INFORMED = 0.7
+    MARKET_PROB_UNINFORMED = 0.3
+    
+    # Base price (would come from market data in real implementation)
+    BASE_PRICE = 100.0
+    
+    def __init__(self, trader_id: str, arrival_rate: float, private_info_prob: float = 0.1,
+                 seed: Optional[int] = None):
+        super().__init__(trader_id, arrival_rate, seed)
         self.private_info_prob = private_info_prob
         self.has_private_info = False
         self.private_info_direction = 0  # -1 for bearish, 1 for bullish
         self.private_info_strength = 0.0
         self.last_event_time = 0.0
+        self._choose_price = self._noise_price  # Swapped when private info arrives or expires
     
     def get_next_event(self, current_time: float) -> Optional[Event]:
         """Generate next order event based on Poisson process."""
         # Generate next arrival time
-        interarrival_time = np.random.exponential(1.0 / self.arrival_rate)
+        interarrival_time = self._next_interarrival()
         next_event_time = max(self.last_event_time, current_time) + interarrival_time
         
         # Ensure we don't schedule events too far in the future initially
@@ -48,10 +58,11 @@ class InformedTrader(BaseAgent):
     def _generate_order(self, current_time: float) -> OrderEvent:
         """Generate an order based on current market conditions and private info."""
         # Determine if we have private information
-        if random.random() < self.private_info_prob:
+        if self._random.random() < self.private_info_prob:
             self.has_private_info = True
-            self.private_info_direction = random.choice([-1, 1])
-            self.private_info_strength = random.uniform(0.01, 0.05)
+            self.private_info_direction = 1 if self._random.getrandbits(1) else -1
+            self.private_info_strength = self._random.uniform(0.01, 0.05)
+            self._choose_price = self._informed_price
         
         # Generate order parameters
         side = self._choose_side()
@@ -59,60 +70,43 @@ class InformedTrader(BaseAgent):
         quantity = self._choose_quantity()
         order_type = self._choose_order_type()
         
-        order_id = f"{self.trader_id}_order_{len(self.active_orders)}"
+        order_id = self._next_order_id()
         
-        return OrderEvent(
-            order_id=order_id,
-            trader_id=self.trader_id,
-            side=side,
-            price=price,
-            quantity=quantity,
-            timestamp=current_time,
-            order_type=order_type
-        )
+        return OrderEvent(order_id, self.trader_id, side, price, quantity,
+                          current_time, order_type)
     
     def _choose_side(self) -> str:
         """Choose order side based on private information."""
         if self.has_private_info:
-            if self.private_info_direction > 0:
-                return 'buy'
-            else:
-                return 'sell'
+            return BUY if self.private_info_direction > 0 else SELL
         else:
-            return random.choice(['buy', 'sell'])
+            return BUY if self._random.getrandbits(1) else SELL
     
-    def _choose_price(self, side: str) -> float:
-        """Choose order price based on side and private information."""
-        # Base price (would come from market data in real implementation)
-        base_price = 100.0
-        
-        if self.has_private_info:
-            # Informed traders place orders more aggressively
-            if side == 'buy':
-                price_adjustment = self.private_info_strength
-            else:
-                price_adjustment = -self.private_info_strength
-        else:
-            # Random price adjustment
-            price_adjustment = random.uniform(-0.02, 0.02)
-        
-        return base_price * (1 + price_adjustment)
+    def _informed_price(self, side: str) -> float:
+        """Choose an aggressive price in the direction of the private information."""
+        # The side always follows the private information direction here
+        return self.BASE_PRICE * (1 + self.private_info_direction * self.private_info_strength)
+    
+    def _noise_price(self, side: str) -> float:
+        """Choose a price with a random adjustment around the base price."""
+        return self.BASE_PRICE * (1 + (self._random.random() * 0.04 - 0.02))
     
     def _choose_quantity(self) -> int:
         """Choose order quantity."""
         if self.has_private_info:
             # Informed traders place larger orders
-            return random.randint(100, 500)
+            return 100 + int(self._random.random() * 401)
         else:
-            return random.randint(10, 100)
+            return 10 + int(self._random.random() * 91)
     
     def _choose_order_type(self) -> str:
         """Choose order type."""
         if self.has_private_info:
             # Informed traders more likely to use market orders
-            return random.choices(['limit', 'market'], weights=[0.3, 0.7])[0]
+            market_prob = self.MARKET_PROB_INFORMED
         else:
-            return random.choices(['limit', 'market'], weights=[0.7, 0.3])[0]
+            market_prob = self.MARKET_PROB_UNINFORMED
+        return MARKET if self._random.random() < market_prob else LIMIT
     
     def process_market_data(self, market_data: Dict[str, Any]):
         """Process market data updates."""
@@ -121,4 +115,5 @@ class InformedTrader(BaseAgent):
             # Private information becomes less valuable over time
             self.private_info_strength *= 0.99
             if self.private_info_strength < 0.001:
-                self.has_private_info = False 
\ No newline at end of file
+                self.has_private_info = False
+                self._choose_price = self._noise_price 
\ No newline at end of file
@@ -4,10 +4,8 @@ Market Maker Agent
 A market maker that provides liquidity by maintaining bid-ask spreads.
 """
 
-import numpy as np
-import random
 from typing import Optional, Dict, Any
-from .base import BaseAgent
+from .base import BaseAgent, BUY, SELL, LIMIT
 from ..events import OrderEvent, CancelEvent, Event
 
 
@@ -19,21 +17,39 @@ class MarketMaker(BaseAgent):
     Manages inventory and adjusts quotes based on market conditions.
     """
     
+    __slots__ = ('inventory_target', 'max_inventory', '_inv_max_inventory', '_base_spread',
+                 'bid_price', 'ask_price', 'spread', 'last_event_time', 'quote_update_interval',
+                 '_buy_orders', '_sell_orders', 'mid_price')
+    
+    STALE_ORDER_AGE = 60.0  # Seconds before a resting quote is cancelled
+    
     def __init__(self, trader_id: str, arrival_rate: float, 
-                 inventory_target: float = 0.0, max_inventory: int = 1000):
-        super().__init__(trader_id, arrival_rate)
+                 inventory_target: float = 0.0, max_inventory: int = 1000,
+                 seed: Optional[int] = None):
+        super().__init__(trader_id, arrival_rate, seed)
         self.inventory_target = inventory_target
         self.max_inventory = max_inventory
+        self._inv_max_inventory = 1.0 / max_inventory
+        self._base_spread = 0.02  # 2 cents
         self.bid_price = 99.0
         self.ask_price = 101.0
         self.spread = 2.0
         self.last_event_time = 0.0
         self.quote_update_interval = 1.0  # Update quotes every second
+        
+        # Open quotes on each side as order_id -> timestamp, oldest first
+        self._buy_orders = {}
+        self._sell_orders = {}
+        
+        # Quotes only change with the mid price or inventory, so they are
+        # refreshed on those updates rather than for every order
+        self.mid_price = 100.0  # Until market data says otherwise
+        self._update_quotes()
     
     def get_next_event(self, current_time: float) -> Optional[Event]:
         """Generate next market making event."""
         # Generate next arrival time
-        interarrival_time = np.random.exponential(1.0 / self.arrival_rate)
+        interarrival_time = self._next_interarrival()
         next_event_time = max(self.last_event_time, current_time) + interarrival_time
         
         # Ensure we don't schedule events too far in the future initially
@@ -43,29 +59,27 @@ class MarketMaker(BaseAgent):
         if next_event_time <= current_time:
             next_event_time = current_time + 0.1  # Small delay if needed
         
-        # Update quotes and generate order
-        self._update_quotes()
-        order = self._generate_market_making_order(next_event_time)
+        # Pull a stale quote if there is one, otherwise quote from the current prices
+        event = self.cancel_stale_orders(next_event_time)
+        if event is None:
+            event = self._generate_market_making_order(next_event_time)
         self.last_event_time = next_event_time
         
-        return order
+        return event
     
     def _update_quotes(self):
         """Update bid and ask prices based on inventory and market conditions."""
-        # Base mid price (would come from market data)
-        mid_price = 100.0
+        mid_price = self.mid_price
         
         # Adjust spread based on inventory
-        inventory_skew = self.inventory / self.max_inventory
+        inventory_skew = self.inventory * self._inv_max_inventory
         spread_adjustment = inventory_skew * 0.5  # Wider spread when inventory is skewed
-        
-        # Base spread
-        base_spread = 0.02  # 2 cents
-        self.spread = base_spread + abs(spread_adjustment)
+        self.spread = self._base_spread + abs(spread_adjustment)
         
         # Set bid and ask prices
-        self.bid_price = mid_price - self.spread / 2
-        self.ask_price = mid_price + self.spread / 2
+        half_spread = self.spread * 0.5
+        self.bid_price = mid_price - half_spread
+        self.ask_price = mid_price + half_spread
         
         # Adjust for inventory management
         if self.inventory > self.inventory_target:
@@ -80,54 +94,77 @@ class MarketMaker(BaseAgent):
         # Determine which side to place order on
         if self.inventory < self.inventory_target:
             # Need to buy
-            side = 'buy'
-            price = self.bid_price
+            buy = True
         elif self.inventory > self.inventory_target:
             # Need to sell
-            side = 'sell'
-            price = self.ask_price
+            buy = False
         else:
             # Balanced inventory, randomly choose side
-            side = random.choice(['buy', 'sell'])
-            price = self.bid_price if side == 'buy' else self.ask_price
+            buy = bool(self._random.getrandbits(1))
         
-        # Determine quantity based on inventory management
-        max_quantity = min(50, abs(self.inventory_target - self.inventory))
-        if max_quantity <= 0:
-            max_quantity = 10  # Minimum order size
+        if buy:
+            side, price, orders = BUY, self.bid_price, self._buy_orders
+        else:
+            side, price, orders = SELL, self.ask_price, self._sell_orders
         
-        quantity = random.randint(10, int(max_quantity))
-        order_type = 'limit'
+        # Determine quantity based on inventory management
+        # (at least the minimum order size of 10)
+        max_quantity = int(max(10, min(50, abs(self.inventory_target - self.inventory))))
+        quantity = 10 + int(self._random.random() * (max_quantity - 9))
+        order_type = LIMIT
         
-        order_id = f"{self.trader_id}_order_{len(self.active_orders)}"
+        order_id = self._next_order_id()
+        orders[order_id] = current_time
         
-        return OrderEvent(
-            order_id=order_id,
-            trader_id=self.trader_id,
-            side=side,
-            price=price,
-            quantity=quantity,
-            timestamp=current_time,
-            order_type=order_type
-        )
+        return OrderEvent(order_id, self.trader_id, side, price, quantity,
+                          current_time, order_type)
     
     def process_market_data(self, market_data: Dict[str, Any]):
         """Process market data updates."""
         # Update quotes based on market data
         if 'mid_price' in market_data:
-            mid_price = market_data['mid_price']
-            # Adjust our quotes to stay competitive
-            self.bid_price = mid_price - self.spread / 2
-            self.ask_price = mid_price + self.spread / 2
+            # Re-center our quotes to stay competitive
+            self.mid_price = market_data['mid_price']
+            self._update_quotes()
+    
+    def order_closed(self, order_id: str):
+        """Drop a filled or cancelled quote."""
+        if self._buy_orders.pop(order_id, None) is None:
+            self._sell_orders.pop(order_id, None)
+    
+    def update_pnl(self, trade_price: float, trade_quantity: int, side: str):
+        """Update P&L and re-skew quotes for the new inventory."""
+        super().update_pnl(trade_price, trade_quantity, side)
+        self._update_quotes()
+    
+    def update_pnl_batch(self, trade_prices, trade_quantities, sides):
+        """Update P&L for a batch of trades and re-skew quotes once."""
+        super().update_pnl_batch(trade_prices, trade_quantities, sides)
+        self._update_quotes()
     
     def cancel_stale_orders(self, current_time: float) -> Optional[CancelEvent]:
-        """Cancel stale orders."""
-        # Simple implementation - cancel orders older than 60 seconds
-        for order_id, order in self.active_orders.items():
-            if current_time - order.timestamp > 60.0:
+        """Cancel a quote that has been resting too long, oldest first per side."""
+        buys, sells = self._buy_orders, self._sell_orders
+        if self.inventory > self.inventory_target:
+            # Long inventory, pull bids before asks
+            queues = (buys, sells)
+        elif self.inventory < self.inventory_target:
+            # Short inventory, pull asks before bids
+            queues = (sells, buys)
+        elif sells and (not buys or next(iter(sells.values())) < next(iter(buys.values()))):
+            queues = (sells, buys)
+        else:
+            queues = (buys, sells)
+        
+        for orders in queues:
+            if not orders:
+                continue
+            order_id = next(iter(orders))
+            if current_time - orders[order_id] > self.STALE_ORDER_AGE:
+                del orders[order_id]
                 return CancelEvent(
                     order_id=order_id,
                     trader_id=self.trader_id,
                     timestamp=current_time
                 )
-        return None 
\ No newline at end of file
+        return None
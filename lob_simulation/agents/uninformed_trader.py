@@ -4,10 +4,8 @@ Uninformed Trader Agent
 A noise trader with no private information that trades randomly.
 """
 
-import numpy as np
-import random
 from typing import Optional, Dict, Any
-from .base import BaseAgent
+from .base import BaseAgent, BUY, SELL, LIMIT, MARKET
 from ..events import OrderEvent, Event
 
 
@@ -19,14 +17,19 @@ class UninformedTrader(BaseAgent):
     No private information, trades randomly.
     """
     
-    def __init__(self, trader_id: str, arrival_rate: float):
-        super().__init__(trader_id, arrival_rate)
+    __slots__ = ('last_event_time',)
+    
+    # Probability of sending a market rather than a limit order
+    MARKET_PROB = 0.2
+    
+    def __init__(self, trader_id: str, arrival_rate: float, seed: Optional[int] = None):
+        super().__init__(trader_id, arrival_rate, seed)
         self.last_event_time = 0.0
     
     def get_next_event(self, current_time: float) -> Optional[Event]:
         """Generate next order event based on Poisson process."""
         # Generate next arrival time
-        interarrival_time = np.random.exponential(1.0 / self.arrival_rate)
+        interarrival_time = self._next_interarrival()
         next_event_time = max(self.last_event_time, current_time) + interarrival_time
         
         # Ensure we don't schedule events too far in the future initially
@@ -43,27 +46,20 @@ class UninformedTrader(BaseAgent):
     
     def _generate_order(self, current_time: float) -> OrderEvent:
         """Generate a random order."""
-        side = random.choice(['buy', 'sell'])
+        side = BUY if self._random.getrandbits(1) else SELL
         
         # Use more realistic price ranges based on current market conditions
         base_price = 100.0  # Would come from market data
-        price_adjustment = random.uniform(-0.01, 0.01)
+        price_adjustment = self._random.uniform(-0.01, 0.01)
         price = base_price * (1 + price_adjustment)
         
-        quantity = random.randint(10, 100)
-        order_type = random.choices(['limit', 'market'], weights=[0.8, 0.2])[0]
+        quantity = 10 + int(self._random.random() * 91)
+        order_type = MARKET if self._random.random() < self.MARKET_PROB else LIMIT
         
-        order_id = f"{self.trader_id}_order_{len(self.active_orders)}"
+        order_id = self._next_order_id()
         
-        return OrderEvent(
-            order_id=order_id,
-            trader_id=self.trader_id,
-            side=side,
-            price=price,
-            quantity=quantity,
-            timestamp=current_time,
-            order_type=order_type
-        )
+        return OrderEvent(order_id, self.trader_id, side, price, quantity,
+                          current_time, order_type)
     
     def process_market_data(self, market_data: Dict[str, Any]):
         """Process market data updates."""
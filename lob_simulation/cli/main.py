@@ -4,24 +4,53 @@ Modular CLI with different commands and options.
 """
 
 import argparse
+import os
 import sys
-from typing import Optional
+from contextlib import contextmanager
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, get_args
+
+import numpy as np
 
 from config.settings import get_config, load_config_from_env
 from lob_simulation.utils.logger import get_logger
-from lob_simulation.web.app import run_web_app
-from lob_simulation.core.simulation import LimitOrderBookSimulation
+from lob_simulation.utils.serialization import dumps_bytes
+from lob_simulation.core.history import ColumnarHistory
+from lob_simulation.core.simulation import (
+    LimitOrderBookSimulation, SimulationConfig, SimulationResults
+)
+from lob_simulation.strategies import StrategyConfig
+
+
+# Output buffer for results files and rows encoded per history chunk
+SAVE_BUFFER_SIZE = 1 << 20
+HISTORY_CHUNK_ROWS = 4096
+
+# Formats the run command can write the recorded histories in
+HISTORY_FORMATS = ('json', 'ndjson', 'parquet', 'npz')
+
+# Stream compression for JSON and ndjson output files
+COMPRESSION_CODECS = ('none', 'zstd')
 
 
 class CLI:
     """Command-line interface for the LOB simulation."""
     
+    _parser: Optional[argparse.ArgumentParser] = None  # Built once, shared by all instances
+    
     def __init__(self):
         self.logger = get_logger("cli")
         self.config = get_config()
     
     def create_parser(self) -> argparse.ArgumentParser:
-        """Create the argument parser."""
+        """Get the argument parser, building it on first use."""
+        if CLI._parser is None:
+            CLI._parser = self._build_parser()
+        return CLI._parser
+    
+    def _build_parser(self) -> argparse.ArgumentParser:
+        """Build the argument parser."""
         parser = argparse.ArgumentParser(
             description="Limit Order Book Simulation CLI",
             formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -46,12 +75,28 @@ Examples:
         run_parser.add_argument('--duration', type=float, default=3600.0, help='Simulation duration in seconds')
         run_parser.add_argument('--strategies', nargs='+', default=['market_making'], help='Strategies to run')
         run_parser.add_argument('--output', help='Output file for results')
+        run_parser.add_argument('--durable', action='store_true',
+                                help='fsync the output files before returning')
+        run_parser.add_argument('--format', choices=HISTORY_FORMATS, default='json',
+                                help='File format for the recorded histories (ndjson and parquet '
+                                     'write one file per history next to the output file, npz '
+                                     'writes all of them to a single archive)')
+        run_parser.add_argument('--compress', choices=COMPRESSION_CODECS, default='none',
+                                help='Compress JSON and ndjson output files (zstd adds a .zst '
+                                     'suffix and requires the zstandard package)')
+        run_parser.add_argument('--profile', metavar='PATH',
+                                help='Profile the run with cProfile and write the stats to PATH '
+                                     '(view with pstats or snakeviz)')
+        self._add_simulation_arguments(run_parser)
         
         # Test command
         test_parser = subparsers.add_parser('test', help='Test strategies')
         test_parser.add_argument('--strategies', nargs='+', default=['market_making'], help='Strategies to test')
         test_parser.add_argument('--duration', type=float, default=600.0, help='Test duration in seconds')
         test_parser.add_argument('--output', help='Output file for results')
+        test_parser.add_argument('--durable', action='store_true',
+                                 help='fsync the output file before returning')
+        self._add_simulation_arguments(test_parser)
         
         # Config command
         config_parser = subparsers.add_parser('config', help='Configuration management')
@@ -61,25 +106,60 @@ Examples:
         
         return parser
     
+    @staticmethod
+    def _add_simulation_arguments(parser: argparse.ArgumentParser) -> None:
+        """Add an optional override flag for every SimulationConfig field."""
+        for field in fields(SimulationConfig):
+            if field.name == 'duration':
+                continue  # Each command has its own --duration default
+            field_type = (get_args(field.type) or (field.type,))[0]  # Unwrap Optional[...]
+            parser.add_argument(f"--{field.name.replace('_', '-')}", dest=field.name,
+                                type=field_type, default=None,
+                                help=f"Simulation {field.name} (default: {field.default})")
+    
+    @staticmethod
+    def _simulation_config(args) -> SimulationConfig:
+        """Build the simulation configuration from the parsed arguments."""
+        overrides = {field.name: getattr(args, field.name) for field in fields(SimulationConfig)
+                     if getattr(args, field.name, None) is not None}
+        return SimulationConfig(**overrides)
+    
     def run_web(self, args) -> None:
         """Run the web interface."""
+        # Flask and Socket.IO are only needed by this command
+        from lob_simulation.web.app import run_web_app
+        
         self.logger.info("Starting web interface...")
         run_web_app(host=args.host, port=args.port, debug=args.debug)
     
     def run_simulation(self, args) -> None:
-        """Run a simulation."""
-        self.logger.info(f"Running simulation for {args.duration} seconds...")
+        """Run a simulation, under cProfile when a profile path is given."""
+        if not args.profile:
+            self._run_simulation(args)
+            return
+        
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            self._run_simulation(args)
+        finally:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            self.logger.info("Profile written to %s", args.profile)
+    
+    def _run_simulation(self, args) -> None:
+        """Run a simulation, save the results and print a summary."""
+        self.logger.info("Running simulation for %s seconds...", args.duration)
         
         # Initialize simulation
-        sim = LimitOrderBookSimulation()
+        sim = LimitOrderBookSimulation(self._simulation_config(args))
         
         # Add strategies
-        for strategy_name in args.strategies:
-            config = {
-                'initial_capital': self.config.agent.initial_capital,
-                'max_position': self.config.agent.max_position
-            }
-            sim.add_strategy(strategy_name, config)
+        sim.add_strategies({
+            strategy_name: self._strategy_config(strategy_name)
+            for strategy_name in args.strategies
+        })
         
         # Run simulation
         sim.run(duration=args.duration)
@@ -89,31 +169,26 @@ Examples:
         
         # Save results if output file specified
         if args.output:
-            import json
-            with open(args.output, 'w') as f:
-                json.dump(results, f, indent=2)
-            self.logger.info(f"Results saved to {args.output}")
+            output = self._save_results(results, args.output, history_format=args.format,
+                                        compress=args.compress, durable=args.durable)
+            self.logger.info("Results saved to %s", output)
         
         # Print summary
-        self._print_simulation_summary(results)
+        self._print_simulation_summary(results, sim.get_all_strategy_performance())
     
     def test_strategies(self, args) -> None:
         """Test strategies."""
-        self.logger.info(f"Testing strategies: {args.strategies}")
+        self.logger.info("Testing strategies: %s", args.strategies)
         
         results = {}
         for strategy_name in args.strategies:
-            self.logger.info(f"Testing strategy: {strategy_name}")
+            self.logger.info("Testing strategy: %s", strategy_name)
             
             # Initialize simulation
-            sim = LimitOrderBookSimulation()
+            sim = LimitOrderBookSimulation(self._simulation_config(args))
             
             # Add single strategy
-            config = {
-                'initial_capital': self.config.agent.initial_capital,
-                'max_position': self.config.agent.max_position
-            }
-            sim.add_strategy(strategy_name, config)
+            sim.add_strategy(strategy_name, self._strategy_config(strategy_name))
             
             # Run simulation
             sim.run(duration=args.duration)
@@ -124,53 +199,200 @@ Examples:
         
         # Save results if output file specified
         if args.output:
-            import json
-            with open(args.output, 'w') as f:
-                json.dump(results, f, indent=2)
-            self.logger.info(f"Test results saved to {args.output}")
+            self._save_results(results, args.output, pretty=True, durable=args.durable)
+            self.logger.info("Test results saved to %s", args.output)
         
         # Print comparison
         self._print_strategy_comparison(results)
     
+    def _strategy_config(self, strategy_name: str) -> StrategyConfig:
+        """Build a strategy configuration from the agent settings."""
+        return StrategyConfig(
+            strategy_name=strategy_name,
+            initial_capital=self.config.agent.initial_capital,
+            max_position=self.config.agent.max_position
+        )
+    
+    def _save_results(self, results: Dict[str, Any], output: str, pretty: bool = False,
+                      history_format: str = 'json', compress: str = 'none',
+                      durable: bool = False) -> Path:
+        """
+        Write results to a JSON file.
+        
+        ``pretty`` indents small payloads such as strategy summaries and writes
+        them in one go. Bulk results are written compactly through a large
+        buffer, with histories streamed as lists of records a chunk at a time
+        so a whole table is never held as dictionaries. With an ``ndjson`` or
+        ``parquet`` history format, each history goes to its own file next to
+        ``output``; with ``npz`` all histories go to one archive. The JSON file
+        records the file name instead. With
+        ``compress='zstd'`` the JSON and ndjson files are compressed as they
+        are written and get a ``.zst`` suffix. With ``durable``, every written
+        file is fsynced once all writes are done.
+        
+        Returns the path of the results file.
+        """
+        output = self._compressed_path(Path(output), compress)
+        written = [output]
+        if pretty:
+            output.write_bytes(dumps_bytes(results, indent=True))
+        else:
+            if history_format != 'json':
+                results, history_paths = self._save_history_files(results, output, history_format,
+                                                                  compress)
+                written += history_paths
+            
+            with self._open_output(output, compress) as f:
+                f.write(b'{')
+                for i, (key, value) in enumerate(results.items()):
+                    f.write(b'%s%s:' % (b',' if i else b'', dumps_bytes(key)))
+                    if isinstance(value, ColumnarHistory):
+                        self._write_history(f, value)
+                    else:
+                        f.write(dumps_bytes(value))
+                f.write(b'}')
+        
+        if durable:
+            self._sync_files(written)
+        return output
+    
+    @staticmethod
+    def _compressed_path(path: Path, compress: str) -> Path:
+        """Get the file name ``path`` is written under with the given compression."""
+        return path.with_name(path.name + '.zst') if compress == 'zstd' else path
+    
+    @staticmethod
+    @contextmanager
+    def _open_output(path: Path, compress: str):
+        """Open ``path`` for buffered binary writing, through a zstd stream if requested."""
+        if compress != 'zstd':
+            with open(path, 'wb', buffering=SAVE_BUFFER_SIZE) as f:
+                yield f
+            return
+        
+        # Optional dependency (pip install lob-simulation[zstd]), imported
+        # before the file is created so a missing package leaves nothing behind
+        import zstandard
+        compressor = zstandard.ZstdCompressor(level=3, threads=-1)
+        with open(path, 'wb', buffering=SAVE_BUFFER_SIZE) as f, compressor.stream_writer(f) as writer:
+            yield writer
+    
+    @staticmethod
+    def _sync_files(paths: List[Path]) -> None:
+        """Flush written files, and on POSIX their directories, to stable storage."""
+        targets = list(paths)
+        if os.name == 'posix':
+            targets += {path.resolve().parent for path in paths}
+        for target in targets:
+            fd = os.open(target, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+    
+    @staticmethod
+    def _write_history(f, history: ColumnarHistory) -> None:
+        """Write a history as a JSON list of records, one chunk of rows at a time."""
+        f.write(b'[')
+        for start in range(0, len(history), HISTORY_CHUNK_ROWS):
+            rows = history.rows(start, start + HISTORY_CHUNK_ROWS)
+            if start:
+                f.write(b',')
+            f.write(dumps_bytes(rows)[1:-1])
+        f.write(b']')
+    
+    def _save_history_files(self, results: Dict[str, Any], output: Path, history_format: str,
+                            compress: str = 'none') -> Tuple[Dict[str, Any], List[Path]]:
+        """
+        Write each history to ``<stem>_<name>.<format>``, or for ``npz`` all of
+        them to a single ``<stem>_histories.npz`` with one array per column
+        (keyed ``<name>.<column>``).
+        
+        Returns the results with each history replaced by its file name, and
+        the paths written.
+        """
+        saved, paths = {}, []
+        stem = output.name.split('.', 1)[0]
+        if history_format == 'npz':
+            path = output.with_name(f"{stem}_histories.npz")
+            arrays = {}
+            for key, value in results.items():
+                if isinstance(value, ColumnarHistory):
+                    for name in value.fields:
+                        column = value.column(name)
+                        # Strings are stored as fixed-width unicode so loading needs no pickle
+                        arrays[f"{key}.{name}"] = column.astype(str) if column.dtype == object else column
+                    value = path.name
+                saved[key] = value
+            np.savez(path, **arrays)
+            return saved, [path]
+        
+        for key, value in results.items():
+            if isinstance(value, ColumnarHistory):
+                path = output.with_name(f"{stem}_{key}.{history_format}")
+                if history_format == 'parquet':
+                    # Requires pyarrow (pip install lob-simulation[parquet])
+                    value.to_frame().to_parquet(path, compression='zstd', index=False)
+                else:
+                    path = self._compressed_path(path, compress)
+                    self._write_ndjson(path, value, compress)
+                paths.append(path)
+                value = path.name
+            saved[key] = value
+        return saved, paths
+    
+    def _write_ndjson(self, path: Path, history: ColumnarHistory, compress: str = 'none') -> None:
+        """Write a history as newline-delimited JSON, one record per line."""
+        with self._open_output(path, compress) as f:
+            for start in range(0, len(history), HISTORY_CHUNK_ROWS):
+                rows = history.rows(start, start + HISTORY_CHUNK_ROWS)
+                f.write(b''.join([dumps_bytes(row) + b'\n' for row in rows]))
+    
     def manage_config(self, args) -> None:
         """Manage configuration."""
         if args.show:
             self._show_config()
         elif args.save:
             self.config.save_to_file(args.save)
-            self.logger.info(f"Configuration saved to {args.save}")
+            self.logger.info("Configuration saved to %s", args.save)
         elif args.load:
             self.config.load_from_file(args.load)
-            self.logger.info(f"Configuration loaded from {args.load}")
+            self.logger.info("Configuration loaded from %s", args.load)
         else:
             self._show_config()
     
     def _show_config(self) -> None:
         """Show current configuration."""
         config_data = self.config.get_all_config()
-        import json
-        print(json.dumps(config_data, indent=2))
+        print(dumps_bytes(config_data, indent=True).decode())
     
-    def _print_simulation_summary(self, results: dict) -> None:
+    def _print_simulation_summary(self, results: SimulationResults,
+                                  strategies: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
         """Print simulation summary."""
-        print("\n=== Simulation Summary ===")
-        print(f"Duration: {results.get('duration', 'N/A')} seconds")
-        print(f"Total trades: {len(results.get('trades', []))}")
-        print(f"Final price: {results.get('final_price', 'N/A')}")
-        print(f"Price volatility: {results.get('volatility', 'N/A')}")
-        
-        if 'strategies' in results:
-            print("\nStrategy Performance:")
-            for strategy_name, performance in results['strategies'].items():
-                print(f"  {strategy_name}:")
-                print(f"    PnL: {performance.get('pnl', 'N/A')}")
-                print(f"    Sharpe Ratio: {performance.get('sharpe_ratio', 'N/A')}")
-                print(f"    Max Drawdown: {performance.get('max_drawdown', 'N/A')}")
+        lines = [
+            "",
+            "=== Simulation Summary ===",
+            f"Duration: {results.config['duration']} seconds",
+            f"Total trades: {len(results.trades)}",
+            f"Final price: {results.orderbook_state.get('mid_price', 'N/A')}",
+            f"Price volatility: {results.metrics.get('price_metrics', {}).get('volatility', 'N/A')}",
+        ]
+        
+        if strategies:
+            lines += ["", "Strategy Performance:"]
+            for strategy_name, performance in strategies.items():
+                lines += [
+                    f"  {strategy_name}:",
+                    f"    PnL: {performance.get('total_pnl', 'N/A')}",
+                    f"    Sharpe Ratio: {performance.get('sharpe_ratio', 'N/A')}",
+                    f"    Max Drawdown: {performance.get('max_drawdown', 'N/A')}",
+                ]
+        
+        # One write for the whole summary
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def _print_strategy_comparison(self, results: dict) -> None:
         """Print strategy comparison."""
-        print("\n=== Strategy Comparison ===")
-        
         # Create comparison table
         headers = ['Strategy', 'PnL', 'Sharpe Ratio', 'Max Drawdown', 'Win Rate']
         rows = []
@@ -178,23 +400,27 @@ Examples:
         for strategy_name, performance in results.items():
             rows.append([
                 strategy_name,
-                f"{performance.get('pnl', 0):.2f}",
+                f"{performance.get('total_pnl', 0):.2f}",
                 f"{performance.get('sharpe_ratio', 0):.3f}",
                 f"{performance.get('max_drawdown', 0):.2f}",
                 f"{performance.get('win_rate', 0):.1%}"
             ])
         
-        # Print table
-        col_widths = [max(len(str(row[i])) for row in [headers] + rows) for i in range(len(headers))]
+        # Column widths in one pass (all cells are already strings)
+        col_widths = [len(h) for h in headers]
+        for row in rows:
+            for i, cell in enumerate(row):
+                if len(cell) > col_widths[i]:
+                    col_widths[i] = len(cell)
         
-        # Header
-        header_str = " | ".join(str(h).ljust(col_widths[i]) for i, h in enumerate(headers))
-        print(header_str)
-        print("-" * len(header_str))
+        # One left-aligned template shared by the header and every row
+        template = " | ".join(f"{{:<{width}}}" for width in col_widths)
+        header_str = template.format(*headers)
+        lines = ["", "=== Strategy Comparison ===", header_str, "-" * len(header_str)]
+        lines.extend(template.format(*row) for row in rows)
         
-        # Rows
-        for row in rows:
-            print(" | ".join(str(cell).ljust(col_widths[i]) for i, cell in enumerate(row)))
+        # One write for the whole table
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def run(self, args: Optional[list] = None) -> None:
         """Run the CLI."""
@@ -225,7 +451,7 @@ Examples:
         except KeyboardInterrupt:
             self.logger.info("Operation cancelled by user")
         except Exception as e:
-            self.logger.error(f"Error: {e}")
+            self.logger.error("Error: %s", e)
             sys.exit(1)
 
 
@@ -3,6 +3,7 @@ Core simulation module for the LOB simulation.
 Contains the main simulation engine and related components.
 """
 
-from .simulation import LimitOrderBookSimulation
+from .simulation import LimitOrderBookSimulation, SimulationResults
+from .history import ColumnarHistory
 
-__all__ = ['LimitOrderBookSimulation'] 
\ No newline at end of file
+__all__ = ['LimitOrderBookSimulation', 'SimulationResults', 'ColumnarHistory'] 
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Columnar history storage for the LOB simulation.
+
+This module provides an append-only table that keeps each field in its own
+NumPy column (structure-of-arrays) instead of a list of per-record objects.
+"""
+
+from collections.abc import Mapping
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnarHistory:
+    """
+    Append-only table stored as growable NumPy columns.
+
+    Columns are preallocated and grow by doubling, so appends do not allocate
+    a record object. Hot paths read whole columns via ``column()`` or plain
+    dictionaries via ``rows()``; indexing and iteration still yield records
+    (dicts, or objects built by ``record_factory``) for existing callers.
+    """
+
+    def __init__(self, fields: Dict[str, Any],
+                 record_factory: Optional[Callable[..., Any]] = None,
+                 capacity: int = 1024):
+        self.fields = tuple(fields)
+        self._dtypes = dict(fields)
+        self._record_factory = record_factory
+        self._getter = attrgetter(*self.fields)
+        self._capacity = max(1, capacity)
+        self._size = 0
+        self._columns = {name: np.empty(self._capacity, dtype=dtype)
+                         for name, dtype in self._dtypes.items()}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        for start in range(0, self._size, 1024):
+            yield from self._records(start, min(start + 1024, self._size))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._size)
+            records = self._records(start, stop) if stop > start else []
+            return records[::step] if step != 1 else records
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("history index out of range")
+        return self._records(index, index + 1)[0]
+
+    def _grow(self) -> None:
+        """Double the capacity of every column."""
+        self._capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(self._capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def append_values(self, *values) -> None:
+        """Append one record given its values in field order."""
+        if self._size == self._capacity:
+            self._grow()
+        index = self._size
+        for column, value in zip(self._columns.values(), values):
+            column[index] = value
+        self._size = index + 1
+
+    def append(self, record: Any) -> None:
+        """Append a record given as a mapping or an object with matching attributes."""
+        if isinstance(record, Mapping):
+            self.append_values(*(record[name] for name in self.fields))
+        else:
+            self.append_values(*self._getter(record))
+
+    def column(self, name: str) -> np.ndarray:
+        """Get a read-only view of one column."""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get records in ``[start, stop)`` as plain dictionaries."""
+        stop = self._size if stop is None else min(stop, self._size)
+        start = max(0, start)
+        if stop <= start:
+            return []
+        columns = [self._columns[name][start:stop].tolist() for name in self.fields]
+        return [dict(zip(self.fields, values)) for values in zip(*columns)]
+
+    def _records(self, start: int, stop: int) -> List[Any]:
+        rows = self.rows(start, stop)
+        if self._record_factory is None:
+            return rows
+        return [self._record_factory(**row) for row in rows]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Get the history as a DataFrame with one column per field."""
+        return pd.DataFrame({name: self._columns[name][:self._size] for name in self.fields},
+                            columns=list(self.fields))
+
+    def discard(self, count: int) -> None:
+        """Drop the oldest ``count`` records, keeping the allocated capacity."""
+        count = min(max(0, count), self._size)
+        if not count:
+            return
+        remaining = self._size - count
+        for column in self._columns.values():
+            column[:remaining] = column[count:self._size]
+        self._size = remaining
+
+    def clear(self) -> None:
+        """Remove all records, keeping the allocated capacity."""
+        self._size = 0
@@ -2,13 +2,17 @@
 Abstract interfaces for the LOB simulation framework.
 
 This module defines the core interfaces that enable loose coupling
-and dependency inversion throughout the system.
+and dependency inversion throughout the system. Interfaces whose methods
+are called per event are plain base classes whose methods raise
+NotImplementedError; the engine and factory interfaces stay ABCs.
 """
 
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional, Protocol
 from dataclasses import dataclass
 
+from ..utils.compat import DATACLASS_SLOTS
+
 
 class MarketDataProvider(Protocol):
     """Protocol for market data providers."""
@@ -26,94 +30,80 @@ class MarketDataProvider(Protocol):
         ...
 
 
-class EventProcessor(ABC):
+class EventProcessor:
     """Abstract interface for event processors."""
     
-    @abstractmethod
     def process_event(self, event: Any) -> None:
         """Process a single event."""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def can_process(self, event_type: str) -> bool:
         """Check if this processor can handle the given event type."""
-        pass
+        raise NotImplementedError
 
 
-class Strategy(ABC):
+class Strategy:
     """Abstract interface for trading strategies."""
     
-    @abstractmethod
     def generate_orders(self, market_data: Dict[str, Any]) -> List[Any]:
         """Generate orders based on market data."""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def update_market_data(self, market_data: Dict[str, Any]) -> None:
         """Update strategy with latest market data."""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def process_trade(self, trade: Any) -> None:
         """Process a trade that affects this strategy."""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def get_performance(self) -> Dict[str, Any]:
         """Get current performance metrics."""
-        pass
+        raise NotImplementedError
 
 
-class Agent(ABC):
+class Agent:
     """Abstract interface for market agents."""
     
-    @abstractmethod
     def get_next_event(self, current_time: float) -> Optional[Any]:
         """Get the next event from this agent."""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def process_market_update(self, market_data: Dict[str, Any]) -> None:
         """Process market updates."""
-        pass
+        raise NotImplementedError
 
 
-class MetricsCalculator(ABC):
+class MetricsCalculator:
     """Abstract interface for metrics calculation."""
     
-    @abstractmethod
     def calculate_metrics(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate metrics from market data."""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def reset(self) -> None:
         """Reset metrics state."""
-        pass
+        raise NotImplementedError
 
 
-class DataRepository(ABC):
+class DataRepository:
     """Abstract interface for data persistence."""
     
-    @abstractmethod
     def save_trade(self, trade: Any) -> None:
         """Save a trade to storage."""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def save_order(self, order: Any) -> None:
         """Save an order to storage."""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def get_trades(self, limit: Optional[int] = None) -> List[Any]:
         """Get trades from storage."""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def get_orders(self, limit: Optional[int] = None) -> List[Any]:
         """Get orders from storage."""
-        pass
+        raise NotImplementedError
 
 
 class SimulationEngine(ABC):
@@ -145,7 +135,7 @@ class SimulationEngine(ABC):
         pass
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class SimulationConfig:
     """Configuration for simulation components."""
     
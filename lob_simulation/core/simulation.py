@@ -7,21 +7,42 @@ agent-based modeling, and microsecond precision timing.
 
 import time
 import heapq
+from itertools import count
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from collections import defaultdict, deque
 import numpy as np
-import pandas as pd
 from numba import jit
 
 from ..orderbook import OrderBook
 from ..agents import InformedTrader, UninformedTrader, MarketMaker
-from ..events import OrderEvent, CancelEvent, TradeEvent, Event
+from ..agents.base import BaseAgent, BUY, SELL
+from ..events import (
+    OrderEvent, CancelEvent, TradeEvent, StrategyTickEvent, Event, EventType, TRADE_FIELDS
+)
 from ..metrics import MarketMetrics, LiquidityMetrics, ImpactMetrics
 from ..strategies import StrategyConfig, create_strategy, BaseStrategy
+from ..utils.compat import DATACLASS_SLOTS
+from .history import ColumnarHistory
 
 
-@dataclass
+# Column layouts for the recorded histories
+TRADE_COLUMNS = dict(zip(TRADE_FIELDS, (object, object, object, np.float64, np.int64, np.float64)))
+ORDER_COLUMNS = {'order_id': object, 'trader_id': object, 'side': object, 'price': np.float64,
+                 'quantity': np.int64, 'timestamp': np.float64, 'order_type': object}
+PRICE_COLUMNS = {'timestamp': np.float64, 'mid_price': np.float64,
+                 'best_bid': np.float64, 'best_ask': np.float64}
+SPREAD_COLUMNS = {'timestamp': np.float64, 'spread': np.float64}
+VOLUME_COLUMNS = {'timestamp': np.float64, 'bid_volume': np.int64, 'ask_volume': np.int64}
+
+# Number of price-impact directions and noise values drawn per refill
+IMPACT_BUFFER_SIZE = 4096
+
+# Simulated seconds between strategy order generation rounds
+STRATEGY_ORDER_INTERVAL = 5.0
+
+
+@dataclass(**DATACLASS_SLOTS)
 class SimulationConfig:
     """Configuration for the simulation."""
     
@@ -56,6 +77,52 @@ class SimulationConfig:
     # Market order parameters
     market_order_alpha: float = 1.0
     market_order_s0: float = 0.01   # Spread threshold for market orders
+    
+    # Simulated seconds between market state snapshots (0 records after every event)
+    record_interval: float = 0.1
+    
+    # Seed for the agents' random streams (None draws fresh entropy)
+    random_seed: Optional[int] = None
+
+
+@dataclass
+class SimulationResults:
+    """
+    Results of a simulation run.
+    
+    Fields are read as attributes; ``results['trades']`` and
+    ``results.get(...)`` still work for code written against the old dict.
+    """
+    
+    config: Dict[str, Any]  # SimulationConfig as a JSON-ready dict
+    trades: ColumnarHistory
+    order_events: ColumnarHistory
+    price_history: ColumnarHistory
+    spread_history: ColumnarHistory
+    volume_history: ColumnarHistory
+    metrics: Dict[str, Any]
+    liquidity_metrics: Dict[str, Any]
+    impact_metrics: Dict[str, Any]
+    orderbook_state: Dict[str, Any]
+    simulation_time: Optional[float] = None  # Wall-clock seconds
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.__dataclass_fields__
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+    
+    def keys(self):
+        return self.__dict__.keys()
+    
+    def items(self):
+        return self.__dict__.items()
 
 
 class LimitOrderBookSimulation:
@@ -70,6 +137,10 @@ class LimitOrderBookSimulation:
     def __init__(self, config: Optional[SimulationConfig] = None):
         """Initialize the simulation."""
         self.config = config or SimulationConfig()
+        self._config_json = asdict(self.config)  # Config is fixed once the simulation is built
+        
+        # Root random stream: seeds the agents, then drives the engine's own draws
+        self._rng = np.random.default_rng(self.config.random_seed)
         
         # Initialize order book
         self.orderbook = OrderBook(
@@ -79,18 +150,35 @@ class LimitOrderBookSimulation:
         
         # Initialize agents
         self.agents = self._initialize_agents()
+        self._agent_index = {agent.trader_id: agent
+                             for agent_list in self.agents.values()
+                             for agent in agent_list}
+        self._resting_orders: Dict[str, BaseAgent] = {}  # Agent orders resting in the book
         
         # Event queue (priority queue for time-based events)
         self.event_queue = []
         self.current_time = 0.0
-        self._event_counter = 0  # Unique counter for event queue tie-breaker
+        self._event_seq = count()  # Monotonic tie-breaker for equal timestamps
+        
+        # Event handlers keyed by event type (other event types are ignored)
+        self._event_handlers = {
+            EventType.ORDER: self._process_order_event,
+            EventType.CANCEL: self._process_cancel_event,
+            EventType.TRADE: self._process_trade_event,
+            EventType.STRATEGY_TICK: self._process_strategy_tick
+        }
+        
+        # Data collection (columnar, see ColumnarHistory)
+        self.trades = ColumnarHistory(TRADE_COLUMNS, record_factory=TradeEvent)
+        self.order_events = ColumnarHistory(ORDER_COLUMNS, record_factory=OrderEvent)
+        self.price_history = ColumnarHistory(PRICE_COLUMNS)
+        self.spread_history = ColumnarHistory(SPREAD_COLUMNS)
+        self.volume_history = ColumnarHistory(VOLUME_COLUMNS)
         
-        # Data collection
-        self.trades = []
-        self.order_events = []
-        self.price_history = []
-        self.spread_history = []
-        self.volume_history = []
+        # Recent windows for live views, maintained alongside the full history
+        self.recent_prices = deque(maxlen=100)  # (timestamp, mid_price)
+        self.recent_trades = deque(maxlen=50)
+        self._next_record_time = 0.0  # Market state is sampled, not recorded per event
         
         # Metrics
         self.metrics = MarketMetrics()
@@ -102,8 +190,16 @@ class LimitOrderBookSimulation:
         self.best_bid = self.mid_price - self.config.tick_size
         self.best_ask = self.mid_price + self.config.tick_size
         
+        # Price-impact directions and noise, drawn in batches and filled on first use
+        self._impact_directions = []
+        self._impact_noise = []
+        self._impact_idx = 0
+        
         # Strategies
         self.strategies = {}
+        self._strategy_version = 0  # Bumped whenever strategy state may change
+        self._strategy_perf_cache = (-1, {})
+        self._orderbook_snapshot_cache = (-1, {})
         
         # Performance tracking
         self.start_time = None
@@ -117,12 +213,18 @@ class LimitOrderBookSimulation:
             'market_makers': []
         }
         
+        # One independent seed per agent, all derived from the configured seed
+        num_agents = (self.config.num_informed_traders + self.config.num_uninformed_traders
+                      + self.config.num_market_makers)
+        seeds = iter(self._rng.integers(2**63, size=num_agents).tolist())
+        
         # Create informed traders
         for i in range(self.config.num_informed_traders):
             trader = InformedTrader(
                 trader_id=f"informed_{i}",
                 arrival_rate=self.config.lambda_informed,
-                private_info_prob=0.1
+                private_info_prob=0.1,
+                seed=next(seeds)
             )
             agents['informed'].append(trader)
         
@@ -130,7 +232,8 @@ class LimitOrderBookSimulation:
         for i in range(self.config.num_uninformed_traders):
             trader = UninformedTrader(
                 trader_id=f"uninformed_{i}",
-                arrival_rate=self.config.lambda_uninformed
+                arrival_rate=self.config.lambda_uninformed,
+                seed=next(seeds)
             )
             agents['uninformed'].append(trader)
         
@@ -140,13 +243,14 @@ class LimitOrderBookSimulation:
                 trader_id=f"mm_{i}",
                 arrival_rate=self.config.lambda_market_maker,
                 inventory_target=0.0,
-                max_inventory=1000
+                max_inventory=1000,
+                seed=next(seeds)
             )
             agents['market_makers'].append(mm)
         
         return agents
     
-    def run(self, duration: Optional[float] = None) -> Dict[str, Any]:
+    def run(self, duration: Optional[float] = None) -> SimulationResults:
         """
         Run the simulation for the specified duration.
         
@@ -154,7 +258,7 @@ class LimitOrderBookSimulation:
             duration: Simulation duration in seconds (uses config if None)
             
         Returns:
-            Dictionary containing simulation results and metrics
+            SimulationResults with the recorded histories and metrics
         """
         duration = duration or self.config.duration
         self.start_time = time.time()
@@ -163,19 +267,24 @@ class LimitOrderBookSimulation:
         self._schedule_initial_events()
         
         # Main simulation loop
-        while self.current_time < duration and self.event_queue:
+        # Stop before the first event scheduled at or after the end of the run
+        while self.event_queue and self.event_queue[0][0] < duration:
             # Get next event
-            event_time, _, event = heapq.heappop(self.event_queue)
-            self.current_time = event_time
+            event = self._pop_event()
             
             # Process event
             self._process_event(event)
             
-            # Schedule next events from agents
-            self._schedule_agent_events()
+            # Schedule the next event for the agent that just acted
+            self._schedule_agent_events(event)
             
-            # Record market state
-            self._record_market_state()
+            # Record market state once the record interval has elapsed
+            if self.current_time >= self._next_record_time:
+                self._record_market_state()
+        
+        # Events remain past the end, so the run covered the full duration
+        if self.event_queue:
+            self.current_time = max(self.current_time, duration)
         
         self.end_time = time.time()
         
@@ -184,40 +293,48 @@ class LimitOrderBookSimulation:
         
         return self.get_results()
     
+    def _push_event(self, event: Event):
+        """Push an event onto the queue, ordered by timestamp then insertion."""
+        heapq.heappush(self.event_queue, (event.timestamp, next(self._event_seq), event))
+    
+    def _pop_event(self) -> Optional[Event]:
+        """Pop the next event and advance the clock to it."""
+        if not self.event_queue:
+            return None
+        event_time, _, event = heapq.heappop(self.event_queue)
+        self.current_time = event_time
+        return event
+    
     def _schedule_initial_events(self):
         """Schedule initial events from all agents."""
-        for agent_type, agent_list in self.agents.items():
-            for agent in agent_list:
-                # Schedule multiple initial events to populate the order book
-                for i in range(3):  # Schedule 3 events per agent initially
-                    next_event = agent.get_next_event(self.current_time)
-                    if next_event:
-                        # Ensure some events happen immediately
-                        if i == 0:
-                            next_event.timestamp = self.current_time + 0.001 * i
-                        self._event_counter += 1
-                        heapq.heappush(self.event_queue, (next_event.timestamp, self._event_counter, next_event))
-    
-    def _schedule_agent_events(self):
-        """Schedule next events from agents that just acted."""
-        # Schedule new events from all agents periodically
-        for agent_type, agent_list in self.agents.items():
-            for agent in agent_list:
-                # Only schedule if we don't have too many events already
-                if len(self.event_queue) < 1000:
-                    next_event = agent.get_next_event(self.current_time)
-                    if next_event:
-                        self._event_counter += 1
-                        heapq.heappush(self.event_queue, (next_event.timestamp, self._event_counter, next_event))
+        for agent in self._agent_index.values():
+            # Schedule multiple initial events to populate the order book
+            for i in range(3):  # Schedule 3 events per agent initially
+                next_event = agent.get_next_event(self.current_time)
+                if next_event:
+                    # Ensure some events happen immediately
+                    if i == 0:
+                        next_event.timestamp = self.current_time + 0.001 * i
+                    self._push_event(next_event)
+        
+        # Strategies generate orders on a recurring timer
+        self._push_event(StrategyTickEvent(self.current_time))
+    
+    def _schedule_agent_events(self, event: Event):
+        """Schedule the next event for the agent that just acted."""
+        # Each agent keeps its own chain of events alive, so the queue only
+        # empties if no agent produces further events
+        agent = self._agent_index.get(getattr(event, 'trader_id', None))
+        if agent is not None:
+            next_event = agent.get_next_event(self.current_time)
+            if next_event:
+                self._push_event(next_event)
     
     def _process_event(self, event: Event):
         """Process a single event."""
-        if isinstance(event, OrderEvent):
-            self._process_order_event(event)
-        elif isinstance(event, CancelEvent):
-            self._process_cancel_event(event)
-        elif isinstance(event, TradeEvent):
-            self._process_trade_event(event)
+        handler = self._event_handlers.get(event.event_type)
+        if handler is not None:
+            handler(event)
     
     def _process_order_event(self, event: OrderEvent):
         """Process an order event."""
@@ -227,85 +344,155 @@ class LimitOrderBookSimulation:
         # Record trades if any
         for trade in trades:
             self.trades.append(trade)
+            self.recent_trades.append(trade)
             self._update_price_impact(trade)
             
             # Update strategies with trade
-            for strategy in self.strategies.values():
-                strategy.process_trade(trade)
+            self._notify_strategies(trade)
+        
+        # Settle fills with the agents on both sides
+        self._settle_agent_orders(event, trades)
         
         # Record order event
         self.order_events.append(event)
     
+    def _settle_agent_orders(self, event: OrderEvent, trades: List[TradeEvent]):
+        """Apply an order's fills to the agents involved and track orders left resting."""
+        resting = self._resting_orders
+        book_orders = self.orderbook.orders
+        agent = self._agent_index.get(event.trader_id)
+        buy = event.side == BUY
+        
+        # Fills per agent as (prices, quantities, sides), applied in one batch each
+        fills = {}
+        if agent is not None and trades:
+            fills[agent] = ([trade.price for trade in trades],
+                            [trade.quantity for trade in trades],
+                            [event.side] * len(trades))
+        
+        for trade in trades:
+            # The resting side is closed once the book no longer holds it
+            resting_id = trade.sell_order_id if buy else trade.buy_order_id
+            owner = resting.get(resting_id)
+            if owner is not None:
+                prices, quantities, sides = fills.setdefault(owner, ([], [], []))
+                prices.append(trade.price)
+                quantities.append(trade.quantity)
+                sides.append(SELL if buy else BUY)
+                if resting_id not in book_orders:
+                    del resting[resting_id]
+                    owner.order_closed(resting_id)
+        
+        for owner, (prices, quantities, sides) in fills.items():
+            owner.update_pnl_batch(prices, quantities, sides)
+        
+        if agent is not None:
+            if event.order_id in book_orders:
+                resting[event.order_id] = agent
+            else:
+                agent.order_closed(event.order_id)
+    
     def _process_cancel_event(self, event: CancelEvent):
         """Process a cancellation event."""
-        self.orderbook.cancel_order(event.order_id)
+        if self.orderbook.cancel_order(event.order_id):
+            agent = self._resting_orders.pop(event.order_id, None)
+            if agent is not None:
+                agent.order_closed(event.order_id)
     
     def _process_trade_event(self, event: TradeEvent):
         """Process a trade event."""
         self.trades.append(event)
+        self.recent_trades.append(event)
         self._update_price_impact(event)
         
         # Notify strategies about the trade
+        self._notify_strategies(event)
+    
+    def _process_strategy_tick(self, event: StrategyTickEvent):
+        """Let every strategy generate orders, then schedule the next round."""
+        if self.strategies:
+            market_data = self._market_data(self.best_ask - self.best_bid,
+                                            self.orderbook.get_bid_volume(),
+                                            self.orderbook.get_ask_volume())
+            for strategy in self.strategies.values():
+                for order in strategy.generate_orders(self.current_time + 0.1, market_data):
+                    self._push_event(order)
+        
+        self._push_event(StrategyTickEvent(self.current_time + STRATEGY_ORDER_INTERVAL))
+    
+    def _notify_strategies(self, trade: TradeEvent):
+        """Let every strategy process a trade."""
+        if not self.strategies:
+            return
         for strategy in self.strategies.values():
-            strategy.process_trade(event)
+            strategy.process_trade(trade)
+        self._strategy_version += 1
     
     def _update_price_impact(self, trade: TradeEvent):
         """Update price impact based on trade."""
         # Use a more balanced approach for price impact
         # Instead of trying to guess trade direction, use a random walk with mean reversion
+        # (plain scalar math on locals: a Numba kernel costs more to call than this takes)
+        config = self.config
         
         # Calculate impact based on trade size (regardless of direction)
-        impact_magnitude = self.config.impact_lambda * (trade.quantity ** self.config.impact_gamma)
+        impact_magnitude = config.impact_lambda * (trade.quantity ** config.impact_gamma)
         
         # Use random direction to avoid systematic bias
         # This simulates the uncertainty in price impact direction
-        trade_direction = np.random.choice([-1, 1], p=[0.5, 0.5])
-        
-        # Calculate temporary impact
-        temp_impact = impact_magnitude * trade_direction
+        trade_direction, noise = self._next_impact_draws()
         
         # Apply temporary impact
-        self.mid_price += temp_impact
+        mid_price = self.mid_price + impact_magnitude * trade_direction
         
         # Add mean reversion to prevent drift (reduced strength)
-        mean_reversion_force = self.config.mean_reversion * (self.config.initial_price - self.mid_price) * 0.0001
-        self.mid_price += mean_reversion_force
+        mid_price += config.mean_reversion * (config.initial_price - mid_price) * 0.0001
         
-        # Add some noise to make it more realistic
-        noise = np.random.normal(0, 0.001)  # Small random noise
-        self.mid_price += noise
+        # Add some noise to make it more realistic (small Gaussian, sd 0.001)
+        mid_price += noise
+        self.mid_price = mid_price
         
         # Update best bid/ask
-        spread = self.best_ask - self.best_bid
-        self.best_bid = self.mid_price - spread / 2
-        self.best_ask = self.mid_price + spread / 2
+        half_spread = (self.best_ask - self.best_bid) / 2
+        self.best_bid = mid_price - half_spread
+        self.best_ask = mid_price + half_spread
+    
+    def _next_impact_draws(self) -> Tuple[int, float]:
+        """Get the next price-impact direction (+/-1) and noise from the cached batches."""
+        if self._impact_idx == len(self._impact_directions):
+            self._impact_directions = (self._rng.integers(0, 2, IMPACT_BUFFER_SIZE) * 2 - 1).tolist()
+            self._impact_noise = self._rng.normal(0.0, 0.001, IMPACT_BUFFER_SIZE).tolist()
+            self._impact_idx = 0
+        index = self._impact_idx
+        self._impact_idx = index + 1
+        return self._impact_directions[index], self._impact_noise[index]
     
     def _record_market_state(self):
         """Record current market state for analysis."""
-        self.price_history.append({
-            'timestamp': self.current_time,
-            'mid_price': self.mid_price,
-            'best_bid': self.best_bid,
-            'best_ask': self.best_ask
-        })
+        self._next_record_time = self.current_time + self.config.record_interval
+        
+        self.price_history.append_values(self.current_time, self.mid_price, self.best_bid, self.best_ask)
+        self.recent_prices.append((self.current_time, self.mid_price))
         
         spread = self.best_ask - self.best_bid
-        self.spread_history.append({
-            'timestamp': self.current_time,
-            'spread': spread
-        })
+        self.spread_history.append_values(self.current_time, spread)
         
         # Calculate volume at best bid/ask
         bid_volume = self.orderbook.get_bid_volume()
         ask_volume = self.orderbook.get_ask_volume()
-        self.volume_history.append({
-            'timestamp': self.current_time,
-            'bid_volume': bid_volume,
-            'ask_volume': ask_volume
-        })
+        self.volume_history.append_values(self.current_time, bid_volume, ask_volume)
+        
+        if not self.strategies:
+            return
         
-        # Update strategies with market data
-        market_data = {
+        # Update strategies with market data (orders come from the strategy tick)
+        market_data = self._market_data(spread, bid_volume, ask_volume)
+        for strategy in self.strategies.values():
+            strategy.update_market_data(market_data)
+    
+    def _market_data(self, spread: float, bid_volume: int, ask_volume: int) -> Dict[str, Any]:
+        """Get the current market state as the dict passed to strategies."""
+        return {
             'mid_price': self.mid_price,
             'best_bid': self.best_bid,
             'best_ask': self.best_ask,
@@ -314,54 +501,54 @@ class LimitOrderBookSimulation:
             'ask_volume': ask_volume,
             'timestamp': self.current_time
         }
-        
-        for strategy in self.strategies.values():
-            strategy.update_market_data(market_data)
-            
-            # Generate strategy orders periodically (every 5 seconds)
-            if self.current_time % 5.0 < 0.1:  # Every ~5 seconds
-                strategy_orders = strategy.generate_orders(self.current_time + 0.1, market_data)
-                for order in strategy_orders:
-                    self._event_counter += 1
-                    heapq.heappush(self.event_queue, (order.timestamp, self._event_counter, order))
     
     def _calculate_final_metrics(self):
         """Calculate final market metrics."""
         # Convert history to DataFrames
-        price_df = pd.DataFrame(self.price_history)
-        spread_df = pd.DataFrame(self.spread_history)
-        volume_df = pd.DataFrame(self.volume_history)
-        trades_df = pd.DataFrame([trade.__dict__ for trade in self.trades])
+        price_df = self.price_history.to_frame()
+        spread_df = self.spread_history.to_frame()
+        volume_df = self.volume_history.to_frame()
+        trades_df = self.trades.to_frame()
         
         # Calculate metrics
         self.metrics.calculate(price_df, spread_df, volume_df, trades_df)
         self.liquidity_metrics.calculate(self.orderbook, price_df, volume_df)
         self.impact_metrics.calculate(trades_df, price_df)
     
-    def get_results(self) -> Dict[str, Any]:
+    def get_results(self) -> SimulationResults:
         """Get simulation results and metrics."""
-        return {
-            'config': self.config,
-            'trades': self.trades,
-            'order_events': self.order_events,
-            'price_history': self.price_history,
-            'spread_history': self.spread_history,
-            'volume_history': self.volume_history,
-            'metrics': self.metrics.get_summary(),
-            'liquidity_metrics': self.liquidity_metrics.get_summary(),
-            'impact_metrics': self.impact_metrics.get_summary(),
-            'orderbook_state': self.orderbook.get_state(),
-            'simulation_time': (self.end_time - self.start_time) if self.end_time and self.start_time else None
-        }
+        return SimulationResults(
+            config=self._config_json,
+            trades=self.trades,
+            order_events=self.order_events,
+            price_history=self.price_history,
+            spread_history=self.spread_history,
+            volume_history=self.volume_history,
+            metrics=self.metrics.get_summary(),
+            liquidity_metrics=self.liquidity_metrics.get_summary(),
+            impact_metrics=self.impact_metrics.get_summary(),
+            orderbook_state=self.orderbook.get_state(),
+            simulation_time=(self.end_time - self.start_time) if self.end_time and self.start_time else None
+        )
     
     def get_orderbook_snapshot(self) -> Dict[str, Any]:
-        """Get current order book snapshot."""
-        return self.orderbook.get_state()
+        """Get current order book snapshot (cached until the book changes)."""
+        version = self.orderbook.version
+        if self._orderbook_snapshot_cache[0] != version:
+            self._orderbook_snapshot_cache = (version, self.orderbook.get_state())
+        return self._orderbook_snapshot_cache[1]
     
     def add_strategy(self, strategy_name: str, config: StrategyConfig):
         """Add a trading strategy to the simulation."""
         strategy = create_strategy(strategy_name, config)
         self.strategies[strategy_name] = strategy
+        self._strategy_version += 1
+    
+    def add_strategies(self, configs: Dict[str, StrategyConfig]):
+        """Add several trading strategies at once, keyed by strategy name."""
+        self.strategies.update({name: create_strategy(name, config) 
+                                for name, config in configs.items()})
+        self._strategy_version += 1
     
     def get_strategy_performance(self, strategy_name: str) -> Dict[str, Any]:
         """Get performance summary for a specific strategy."""
@@ -370,25 +557,39 @@ class LimitOrderBookSimulation:
         return {}
     
     def get_all_strategy_performance(self) -> Dict[str, Dict[str, Any]]:
-        """Get performance summary for all strategies."""
-        return {name: strategy.get_performance_summary() 
-                for name, strategy in self.strategies.items()}
+        """Get performance summary for all strategies (cached until they change)."""
+        if self._strategy_perf_cache[0] != self._strategy_version:
+            performance = {name: strategy.get_performance_summary() 
+                           for name, strategy in self.strategies.items()}
+            self._strategy_perf_cache = (self._strategy_version, performance)
+        return self._strategy_perf_cache[1]
     
     def add_custom_event(self, event: Event):
         """Add a custom event to the simulation."""
-        self._event_counter += 1
-        heapq.heappush(self.event_queue, (event.timestamp, self._event_counter, event))
+        self._push_event(event)
+    
+    def trim_history(self, max_records: int):
+        """Drop the oldest records so no history holds more than ``max_records``."""
+        for history in (self.trades, self.order_events, self.price_history,
+                        self.spread_history, self.volume_history):
+            history.discard(len(history) - max_records)
+        book_trades = self.orderbook.trades
+        del book_trades[:max(0, len(book_trades) - max_records)]
     
     def reset(self):
         """Reset the simulation to initial state."""
         self.orderbook.reset()
+        self._resting_orders.clear()
         self.event_queue = []
         self.current_time = 0.0
-        self.trades = []
-        self.order_events = []
-        self.price_history = []
-        self.spread_history = []
-        self.volume_history = []
+        self.trades.clear()
+        self.order_events.clear()
+        self.price_history.clear()
+        self.spread_history.clear()
+        self.volume_history.clear()
+        self.recent_prices.clear()
+        self.recent_trades.clear()
+        self._next_record_time = 0.0
         self.mid_price = self.config.initial_price
         self.best_bid = self.mid_price - self.config.tick_size
         self.best_ask = self.mid_price + self.config.tick_size
@@ -396,26 +597,26 @@ class LimitOrderBookSimulation:
     def run_step(self, max_events: int = 10):
         """Run a single step of the simulation, processing up to max_events."""
         if not self.event_queue:
-            # If no events, schedule some new ones
-            self._schedule_agent_events()
             return
         
         events_processed = 0
-        while self.event_queue and events_processed < max_events:
+        while events_processed < max_events:
             # Get next event
-            event_time, _, event = heapq.heappop(self.event_queue)
-            self.current_time = event_time
+            event = self._pop_event()
+            if event is None:
+                break
             
             # Process event
             self._process_event(event)
             
-            # Record market state
-            self._record_market_state()
+            # Schedule the next event for the agent that just acted
+            self._schedule_agent_events(event)
+            
+            # Record market state once the record interval has elapsed
+            if self.current_time >= self._next_record_time:
+                self._record_market_state()
             
             events_processed += 1
-        
-        # Schedule new events after processing
-        self._schedule_agent_events()
     
     def stop(self):
         """Stop the simulation."""
@@ -430,7 +631,7 @@ class LimitOrderBookSimulation:
     @property
     def price_times(self):
         """Get the timestamps of price history."""
-        return [entry['timestamp'] for entry in self.price_history]
+        return self.price_history.column('timestamp').tolist()
     
     @property
     def trade_history(self):
@@ -1,8 +1,9 @@
 from .base import EventType, Event
 from .order import OrderEvent
 from .cancel import CancelEvent
-from .trade import TradeEvent
+from .trade import TradeEvent, TRADE_FIELDS
 from .market_data import MarketDataEvent
+from .strategy_tick import StrategyTickEvent
 from .queue import EventQueue
 
 __all__ = [
@@ -11,6 +12,8 @@ __all__ = [
     "OrderEvent",
     "CancelEvent",
     "TradeEvent",
+    "TRADE_FIELDS",
     "MarketDataEvent",
+    "StrategyTickEvent",
     "EventQueue"
 ]
@@ -1,6 +1,5 @@
-from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any
+from typing import Any, Dict, Tuple
 
 class EventType(Enum):
     """Types of events in the simulation."""
@@ -8,14 +7,25 @@ class EventType(Enum):
     CANCEL = "cancel"
     TRADE = "trade"
     MARKET_DATA = "market_data"
+    STRATEGY_TICK = "strategy_tick"
 
-class Event(ABC):
+class Event:
     """Base class for all events in the simulation."""
+    __slots__ = ('event_type', 'timestamp')
+
+    # Data fields declared by subclasses in their __slots__, base classes first
+    _fields: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = cls._fields + tuple(cls.__dict__.get('__slots__', ()))
+
     def __init__(self, event_type: EventType, timestamp: float):
         self.event_type = event_type
         self.timestamp = timestamp
 
-    @abstractmethod
-    def process(self) -> Any:
-        """Process the event and return any results."""
-        pass
+    def process(self) -> Dict[str, Any]:
+        """Get the event's data fields and timestamp as a dictionary."""
+        record = {name: getattr(self, name) for name in self._fields}
+        record['timestamp'] = self.timestamp
+        return record
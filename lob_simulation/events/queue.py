@@ -1,3 +1,4 @@
+from itertools import count
 from typing import Optional
 from .base import Event
 
@@ -5,13 +6,12 @@ class EventQueue:
     """Priority queue for managing events in chronological order."""
     def __init__(self):
         self.events = []
-        self._event_counter = 0  # Unique counter for event queue tie-breaker
+        self._event_seq = count()  # Monotonic tie-breaker for equal timestamps
 
     def add_event(self, event: Event):
         """Add an event to the queue."""
         import heapq
-        self._event_counter += 1
-        heapq.heappush(self.events, (event.timestamp, self._event_counter, event))
+        heapq.heappush(self.events, (event.timestamp, next(self._event_seq), event))
 
     def get_next_event(self) -> Optional[Event]:
         """Get the next event from the queue."""
@@ -0,0 +1,8 @@
+from .base import Event, EventType
+
+class StrategyTickEvent(Event):
+    """Timer that asks every strategy for new orders; it reschedules itself."""
+    __slots__ = ()
+
+    def __init__(self, timestamp: float):
+        super().__init__(EventType.STRATEGY_TICK, timestamp)
@@ -1,15 +1,11 @@
-from dataclasses import dataclass
-from typing import Any
 from .base import Event, EventType
 
-@dataclass
+# Column order used when trades are converted in bulk
+TRADE_FIELDS = ('trade_id', 'buy_order_id', 'sell_order_id', 'price', 'quantity', 'timestamp')
+
 class TradeEvent(Event):
     """Represents a trade execution."""
-    trade_id: str
-    buy_order_id: str
-    sell_order_id: str
-    price: float
-    quantity: int
+    __slots__ = ('trade_id', 'buy_order_id', 'sell_order_id', 'price', 'quantity')
 
     def __init__(self, trade_id: str, buy_order_id: str, sell_order_id: str,
                  price: float, quantity: int, timestamp: float):
@@ -19,14 +15,3 @@ class TradeEvent(Event):
         self.sell_order_id = sell_order_id
         self.price = price
         self.quantity = quantity
-
-    def process(self) -> Any:
-        """Process the trade event."""
-        return {
-            'trade_id': self.trade_id,
-            'buy_order_id': self.buy_order_id,
-            'sell_order_id': self.sell_order_id,
-            'price': self.price,
-            'quantity': self.quantity,
-            'timestamp': self.timestamp
-        }
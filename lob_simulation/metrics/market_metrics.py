@@ -8,7 +8,6 @@ import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
-from scipy import stats
 
 from .base import BaseMetrics
 
@@ -54,7 +53,9 @@ class MarketMetrics(BaseMetrics):
         returns = price_df['mid_price'].pct_change().dropna()
         self.price_volatility = returns.std() * np.sqrt(252 * 24 * 3600)  # Annualized
         
-        # Price trend (linear regression slope)
+        # Price trend (linear regression slope); scipy.stats is slow to import,
+        # so it is only loaded once metrics are actually computed
+        from scipy import stats
         x = np.arange(len(price_df))
         y = price_df['mid_price'].values
         slope, _, _, _, _ = stats.linregress(x, y)
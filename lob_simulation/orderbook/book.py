@@ -26,6 +26,8 @@ class OrderBook:
         self.bid_volume = defaultdict(int)
         self.ask_volume = defaultdict(int)
         self.trades = []
+        self.trade_count = 0  # Trades ever matched; ``trades`` may be trimmed
+        self.version = 0  # Incremented on every mutation
 
     def add_order(self, order_event: OrderEvent, current_time: float = 0.0) -> List[TradeEvent]:
         order = Order(
@@ -42,11 +44,14 @@ class OrderBook:
         else:
             trades = process_sell_order(self, order, current_time)
         update_market_stats(self)
+        self.version += 1
         return trades
 
     def cancel_order(self, order_id: str) -> bool:
         result = matching_cancel_order(self, order_id)
         update_market_stats(self)
+        if result:
+            self.version += 1
         return result
 
     def get_bid_volume(self) -> int:
@@ -63,3 +68,4 @@ class OrderBook:
 
     def reset(self):
         state_reset(self)
+        self.version += 1
@@ -1,4 +1,5 @@
 from .order import Order
+from .utils import insert_price_level, remove_price_level
 from typing import List
 from lob_simulation.events import TradeEvent
 
@@ -16,7 +17,7 @@ def process_buy_order(self, order: Order, current_time: float = 0.0) -> List[Tra
         ask_order = ask_orders[0]
         trade_quantity = min(remaining_quantity, ask_order.visible_quantity or 0)
         trade = TradeEvent(
-            trade_id=f"trade_{len(self.trades)}",
+            trade_id=f"trade_{self.trade_count}",
             buy_order_id=order.order_id,
             sell_order_id=ask_order.order_id,
             price=best_ask_price,
@@ -25,6 +26,7 @@ def process_buy_order(self, order: Order, current_time: float = 0.0) -> List[Tra
         )
         trades.append(trade)
         self.trades.append(trade)
+        self.trade_count += 1
         remaining_quantity -= trade_quantity
         if ask_order.visible_quantity is not None:
             ask_order.visible_quantity -= trade_quantity
@@ -51,7 +53,7 @@ def process_sell_order(self, order: Order, current_time: float = 0.0) -> List[Tr
         bid_order = bid_orders[0]
         trade_quantity = min(remaining_quantity, bid_order.visible_quantity or 0)
         trade = TradeEvent(
-            trade_id=f"trade_{len(self.trades)}",
+            trade_id=f"trade_{self.trade_count}",
             buy_order_id=bid_order.order_id,
             sell_order_id=order.order_id,
             price=best_bid_price,
@@ -60,6 +62,7 @@ def process_sell_order(self, order: Order, current_time: float = 0.0) -> List[Tr
         )
         trades.append(trade)
         self.trades.append(trade)
+        self.trade_count += 1
         remaining_quantity -= trade_quantity
         if bid_order.visible_quantity is not None:
             bid_order.visible_quantity -= trade_quantity
@@ -85,17 +88,13 @@ def add_bid_order(self, order: Order):
     price = order.price
     self.bids[price].append(order)
     self.bid_volume[price] += order.quantity
-    if price not in self.bid_prices:
-        self.bid_prices.append(price)
-        self.bid_prices.sort(reverse=True)
+    insert_price_level(self.bid_prices, price, descending=True)
 
 def add_ask_order(self, order: Order):
     price = order.price
     self.asks[price].append(order)
     self.ask_volume[price] += order.quantity
-    if price not in self.ask_prices:
-        self.ask_prices.append(price)
-        self.ask_prices.sort()
+    insert_price_level(self.ask_prices, price)
 
 def cancel_order(self, order_id: str) -> bool:
     if order_id not in self.orders:
@@ -118,7 +117,7 @@ def remove_bid_order(self, order: Order):
             break
     if not orders_at_price:
         del self.bids[price]
-        self.bid_prices.remove(price)
+        remove_price_level(self.bid_prices, price, descending=True)
 
 def remove_ask_order(self, order: Order):
     price = order.price
@@ -130,4 +129,4 @@ def remove_ask_order(self, order: Order):
             break
     if not orders_at_price:
         del self.asks[price]
-        self.ask_prices.remove(price)
+        remove_price_level(self.ask_prices, price)
@@ -39,7 +39,7 @@ def get_state(self) -> Dict[str, Any]:
         'ask_volume': get_ask_volume(self),
         'depth': get_depth(self),
         'num_orders': len(self.orders),
-        'num_trades': len(self.trades)
+        'num_trades': self.trade_count
     }
 
 def reset(self):
@@ -51,6 +51,7 @@ def reset(self):
     self.bid_volume.clear()
     self.ask_volume.clear()
     self.trades.clear()
+    self.trade_count = 0
     self.best_bid = 0.0
     self.best_ask = float('inf')
     self.mid_price = 0.0
@@ -0,0 +1,33 @@
+from bisect import bisect_left
+from typing import List
+
+# Sorted price-level helpers. Bid prices are kept in descending order and ask
+# prices in ascending order so that index 0 is always the best level.
+
+def _level_index(prices: List[float], price: float, descending: bool) -> int:
+    if not descending:
+        return bisect_left(prices, price)
+    lo, hi = 0, len(prices)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if prices[mid] > price:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def insert_price_level(prices: List[float], price: float, descending: bool = False) -> bool:
+    """Insert a price level keeping the list sorted; returns False if it already exists."""
+    index = _level_index(prices, price, descending)
+    if index < len(prices) and prices[index] == price:
+        return False
+    prices.insert(index, price)
+    return True
+
+def remove_price_level(prices: List[float], price: float, descending: bool = False) -> bool:
+    """Remove a price level from the sorted list; returns False if it is missing."""
+    index = _level_index(prices, price, descending)
+    if index < len(prices) and prices[index] == price:
+        del prices[index]
+        return True
+    return False
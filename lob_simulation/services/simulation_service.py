@@ -132,22 +132,12 @@ class SimulationService:
             }
             
             # Get price history
-            price_data = self.simulation.price_history[-100:] if self.simulation.price_history else []
-            prices = [entry.get('mid_price', 100.0) for entry in price_data]
-            times = [entry.get('timestamp', 0.0) for entry in price_data]
+            recent_prices = self.simulation.recent_prices
+            prices = [price for _, price in recent_prices]
+            times = [timestamp for timestamp, _ in recent_prices]
             
             # Get trade history
-            trade_history = []
-            for trade in self.simulation.trades[-50:]:
-                if hasattr(trade, 'process'):
-                    trade_history.append(trade.process())
-                else:
-                    trade_history.append({
-                        'trade_id': getattr(trade, 'trade_id', 'unknown'),
-                        'price': getattr(trade, 'price', 0.0),
-                        'quantity': getattr(trade, 'quantity', 0),
-                        'timestamp': getattr(trade, 'timestamp', 0.0)
-                    })
+            trade_history = [trade.process() for trade in self.simulation.recent_trades]
             
             # Get strategy performance
             strategy_performance = {}
@@ -0,0 +1,10 @@
+"""
+Compatibility helpers for the LOB simulation.
+Features that depend on the running Python version.
+"""
+
+import sys
+
+
+# Keyword arguments for @dataclass that add __slots__ where supported (3.10+)
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
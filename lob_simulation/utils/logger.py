@@ -12,7 +12,12 @@ from config.settings import get_config
 
 
 class SimulationLogger:
-    """Centralized logger for the LOB simulation."""
+    """
+    Centralized logger for the LOB simulation.
+    
+    Extra arguments are merged into the message with %-formatting only if the
+    record is emitted, as with the standard ``logging`` methods.
+    """
     
     def __init__(self, name: str = "lob_simulation"):
         self.name = name
@@ -50,29 +55,33 @@ class SimulationLogger:
         # Prevent propagation to root logger
         self.logger.propagate = False
     
-    def debug(self, message: str) -> None:
+    def isEnabledFor(self, level: int) -> bool:
+        """Check whether messages at ``level`` would be emitted."""
+        return self.logger.isEnabledFor(level)
+    
+    def debug(self, message: str, *args) -> None:
         """Log debug message."""
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
     
-    def info(self, message: str) -> None:
+    def info(self, message: str, *args) -> None:
         """Log info message."""
-        self.logger.info(message)
+        self.logger.info(message, *args)
     
-    def warning(self, message: str) -> None:
+    def warning(self, message: str, *args) -> None:
         """Log warning message."""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
     
-    def error(self, message: str) -> None:
+    def error(self, message: str, *args) -> None:
         """Log error message."""
-        self.logger.error(message)
+        self.logger.error(message, *args)
     
-    def critical(self, message: str) -> None:
+    def critical(self, message: str, *args) -> None:
         """Log critical message."""
-        self.logger.critical(message)
+        self.logger.critical(message, *args)
     
-    def exception(self, message: str) -> None:
+    def exception(self, message: str, *args) -> None:
         """Log exception with traceback."""
-        self.logger.exception(message)
+        self.logger.exception(message, *args)
 
 
 # Global logger instance
@@ -99,22 +108,22 @@ class LoggerMixin:
         super().__init__(*args, **kwargs)
         self.logger = get_logger(self.__class__.__name__)
     
-    def log_debug(self, message: str) -> None:
+    def log_debug(self, message: str, *args) -> None:
         """Log debug message."""
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
     
-    def log_info(self, message: str) -> None:
+    def log_info(self, message: str, *args) -> None:
         """Log info message."""
-        self.logger.info(message)
+        self.logger.info(message, *args)
     
-    def log_warning(self, message: str) -> None:
+    def log_warning(self, message: str, *args) -> None:
         """Log warning message."""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
     
-    def log_error(self, message: str) -> None:
+    def log_error(self, message: str, *args) -> None:
         """Log error message."""
-        self.logger.error(message)
+        self.logger.error(message, *args)
     
-    def log_exception(self, message: str) -> None:
+    def log_exception(self, message: str, *args) -> None:
         """Log exception with traceback."""
-        self.logger.exception(message) 
\ No newline at end of file
+        self.logger.exception(message, *args) 
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+Serialization utilities for the LOB simulation.
+Fast JSON encoding and decoding backed by orjson.
+"""
+
+from typing import Any, Union
+
+import orjson
+
+
+# NumPy arrays/scalars and non-string dict keys are handled natively
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj: Any, *args, **kwargs) -> str:
+    """
+    Serialize an object to a JSON string.
+
+    Extra arguments are accepted for compatibility with the stdlib ``json``
+    interface (e.g. ``separators``) and ignored; output is always compact.
+    """
+    return orjson.dumps(obj, option=JSON_OPTIONS).decode()
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 JSON bytes, e.g. for binary socket frames.
+
+    ``indent`` pretty-prints with two-space indentation.
+    """
+    option = JSON_OPTIONS | orjson.OPT_INDENT_2 if indent else JSON_OPTIONS
+    return orjson.dumps(obj, option=option)
+
+
+def loads(data: Union[str, bytes], *args, **kwargs) -> Any:
+    """Deserialize a JSON string or bytes."""
+    return orjson.loads(data)
@@ -4,9 +4,11 @@ Modular Flask application with WebSocket support.
 """
 
 from flask import Flask, render_template, jsonify, request
+from flask.json.provider import JSONProvider
 from flask_socketio import SocketIO, emit
-import threading
 import time
+import logging
+from dataclasses import replace
 from typing import Dict, Any, Optional
 
 import sys
@@ -14,7 +16,39 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from config.settings import get_config
 from lob_simulation.utils.logger import get_logger, LoggerMixin
+from lob_simulation.utils import serialization
 from lob_simulation.core.simulation import LimitOrderBookSimulation
+from lob_simulation.strategies import StrategyConfig
+
+
+# Defaults for strategies started from the web UI and the fields a request may override
+DEFAULT_STRATEGY_CONFIG = StrategyConfig(initial_capital=10000, max_position=100,
+                                         min_spread=0.01, max_spread=0.05)
+STRATEGY_OVERRIDES = ('initial_capital', 'max_position', 'min_spread', 'max_spread')
+
+# Simulated seconds between periodic debug messages from the broadcast loop
+DEBUG_LOG_INTERVAL = 10.0
+
+# Broadcast channels and their emit intervals, in units of the client refresh rate:
+# the order book twice per refresh, prices/trades once, strategy performance every fifth
+CHANNEL_INTERVALS = {'order_book': 0.5, 'trades': 1.0, 'strategy': 5.0}
+
+# Simulated seconds advanced per wall-clock second, and the loop's real sleep between steps
+SIMULATION_SPEED = 10.0
+LOOP_SLEEP = 0.005
+
+# Records a web session keeps per history; the oldest half is dropped once one exceeds it
+WEB_HISTORY_LIMIT = 100000
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider that encodes responses with orjson."""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return serialization.dumps(obj)
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return serialization.loads(s)
 
 
 class WebApplication(LoggerMixin):
@@ -24,11 +58,14 @@ class WebApplication(LoggerMixin):
         super().__init__()
         self.config = get_config()
         self.app = Flask(__name__, template_folder='../../templates', static_folder='../../static')
-        self.socketio = SocketIO(self.app, cors_allowed_origins="*")
+        self.app.json = OrjsonProvider(self.app)
+        self.socketio = SocketIO(self.app, cors_allowed_origins="*", json=serialization)
         self.simulation: Optional[LimitOrderBookSimulation] = None
-        self.simulation_thread: Optional[threading.Thread] = None
+        self.simulation_task: Optional[Any] = None
         self.is_running = False
         self.refresh_rate = 1.0
+        self._reset_delta_state()
+        self._index_html: Optional[str] = None
         
         self._setup_routes()
         self._setup_socketio_events()
@@ -39,7 +76,10 @@ class WebApplication(LoggerMixin):
         @self.app.route('/')
         def index():
             """Main page."""
-            return render_template('index.html')
+            # The dashboard shell is static, so render it once; debug mode re-renders for template edits
+            if self._index_html is None or self.app.debug:
+                self._index_html = render_template('index.html')
+            return self._index_html
         
         @self.app.route('/api/start_simulation', methods=['POST'])
         def start_simulation():
@@ -54,26 +94,25 @@ class WebApplication(LoggerMixin):
                 
                 # Debug: Log strategy configuration
                 self.log_info(f"Starting simulation with strategies: {list(strategy_config.keys())}")
-                self.log_info(f"Strategy config details: {strategy_config}")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.log_debug(f"Strategy config details: {strategy_config}")
                 
                 # Store refresh rate for the simulation loop
                 self.refresh_rate = refresh_rate
                 
                 # Initialize simulation
                 self.simulation = LimitOrderBookSimulation()
+                self._reset_delta_state()
                 
                 # Add strategies
-                from lob_simulation.strategies import StrategyConfig
-                for strategy_name, config_dict in strategy_config.items():
-                    config = StrategyConfig(
-                        strategy_name=strategy_name,
-                        initial_capital=config_dict.get('initial_capital', 10000),
-                        max_position=config_dict.get('max_position', 100),
-                        min_spread=config_dict.get('min_spread', 0.01),
-                        max_spread=config_dict.get('max_spread', 0.05)
-                    )
-                    self.simulation.add_strategy(strategy_name, config)
-                    self.log_info(f"Added strategy: {strategy_name}")
+                strategy_cfgs = {
+                    strategy_name: replace(DEFAULT_STRATEGY_CONFIG, strategy_name=strategy_name,
+                                           **{key: config_dict[key] for key in STRATEGY_OVERRIDES
+                                              if key in config_dict})
+                    for strategy_name, config_dict in strategy_config.items()
+                }
+                self.simulation.add_strategies(strategy_cfgs)
+                self.log_info(f"Added strategies: {list(strategy_cfgs)}")
 
                 # PATCH: Explicitly update all strategies with current market state and trigger initial orders
                 market_data = {
@@ -100,13 +139,9 @@ class WebApplication(LoggerMixin):
                 self.simulation.run_step(max_events=50)
                 self.log_info(f"After initial step: {len(self.simulation.order_book.bids)} bid levels, {len(self.simulation.order_book.asks)} ask levels")
                 
-                # Start simulation in background thread
+                # Start simulation as a background task of the async server
                 self.is_running = True
-                self.simulation_thread = threading.Thread(
-                    target=self._run_simulation_loop,
-                    daemon=True
-                )
-                self.simulation_thread.start()
+                self.simulation_task = self.socketio.start_background_task(self._run_simulation_loop)
                 
                 self.log_info("Simulation started")
                 return jsonify({"status": "started"})
@@ -155,7 +190,7 @@ class WebApplication(LoggerMixin):
                 if not self.simulation:
                     return jsonify({"error": "No simulation running"}), 400
                 
-                order_book_data = self.simulation.order_book.get_state()
+                order_book_data = self.simulation.get_orderbook_snapshot()
                 return jsonify(order_book_data)
             except Exception as e:
                 self.log_exception(f"Error getting order book: {e}")
@@ -168,10 +203,9 @@ class WebApplication(LoggerMixin):
                 if not self.simulation:
                     return jsonify({"error": "No simulation running"}), 400
                 
-                # Extract price data from price_history
-                price_data = self.simulation.price_history
-                prices = [entry.get('mid_price', 100.0) for entry in price_data]
-                times = [entry.get('timestamp', 0.0) for entry in price_data]
+                price_history = self.simulation.price_history
+                prices = price_history.column('mid_price').tolist()
+                times = price_history.column('timestamp').tolist()
                 
                 return jsonify({
                     "prices": prices,
@@ -188,19 +222,7 @@ class WebApplication(LoggerMixin):
                 if not self.simulation:
                     return jsonify({"error": "No simulation running"}), 400
                 
-                # Convert trade events to dictionaries for JSON serialization
-                trades = []
-                for trade in self.simulation.trades:
-                    if hasattr(trade, 'process'):
-                        trades.append(trade.process())
-                    else:
-                        # Fallback for non-event objects
-                        trades.append({
-                            'trade_id': getattr(trade, 'trade_id', 'unknown'),
-                            'price': getattr(trade, 'price', 0.0),
-                            'quantity': getattr(trade, 'quantity', 0),
-                            'timestamp': getattr(trade, 'timestamp', 0.0)
-                        })
+                trades = self.simulation.trades.rows()
                 
                 return jsonify({
                     "trades": trades
@@ -216,17 +238,12 @@ class WebApplication(LoggerMixin):
                 if not self.simulation:
                     return jsonify({"error": "No simulation running"}), 400
                 
-                # Debug: Log available strategies
-                self.log_info(f"Available strategies: {list(self.simulation.strategies.keys())}")
-                
                 performance = {}
                 for strategy_name in self.simulation.strategies:
-                    strategy_perf = self.simulation.get_strategy_performance(strategy_name)
-                    performance[strategy_name] = strategy_perf
-                    self.log_info(f"Strategy {strategy_name} performance: {strategy_perf}")
+                    performance[strategy_name] = self.simulation.get_strategy_performance(strategy_name)
                 
-                # Debug: Log final performance object
-                self.log_info(f"Returning performance for {len(performance)} strategies: {list(performance.keys())}")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.log_debug(f"Returning performance for {len(performance)} strategies: {performance}")
                 
                 return jsonify(performance)
             except Exception as e:
@@ -241,165 +258,181 @@ class WebApplication(LoggerMixin):
             """Handle client connection."""
             self.log_info("Client connected")
             emit('connected', {'status': 'connected'})
+            
+            # New clients start from a full snapshot; broadcasts are deltas
+            if self.simulation and self.is_running:
+                emit('market_update', self._build_market_snapshot())
         
         @self.socketio.on('disconnect')
         def handle_disconnect():
             """Handle client disconnection."""
             self.log_info("Client disconnected")
         
+        @self.socketio.on('set_refresh_rate')
+        def handle_set_refresh_rate(data):
+            """Handle refresh rate change from client."""
+            try:
+                self.refresh_rate = float(data.get('refresh_rate', self.refresh_rate))
+            except (TypeError, ValueError, AttributeError):
+                self.log_warning(f"Ignoring invalid refresh rate: {data}")
+        
         @self.socketio.on('request_update')
         def handle_update_request():
             """Handle update request from client."""
             if self.simulation and self.is_running:
-                # Convert trade events to dictionaries for JSON serialization
-                trade_history = []
-                for trade in self.simulation.trades[-50:]:
-                    if hasattr(trade, 'process'):
-                        trade_history.append(trade.process())
-                    else:
-                        # Fallback for non-event objects
-                        trade_history.append({
-                            'trade_id': getattr(trade, 'trade_id', 'unknown'),
-                            'price': getattr(trade, 'price', 0.0),
-                            'quantity': getattr(trade, 'quantity', 0),
-                            'timestamp': getattr(trade, 'timestamp', 0.0)
-                        })
-                
-                # Extract price data from price_history
-                price_data = self.simulation.price_history[-100:] if self.simulation.price_history else []
-                prices = [entry.get('mid_price', 100.0) for entry in price_data]
-                times = [entry.get('timestamp', 0.0) for entry in price_data]
-                
-                # Get order book state and convert to frontend format
-                order_book_state = self.simulation.order_book.get_state()
-                
-                # Convert depth format from (price, volume) tuples to {price, quantity} objects
-                bids = [{'price': price, 'quantity': volume} for price, volume in order_book_state.get('depth', {}).get('bids', [])]
-                asks = [{'price': price, 'quantity': volume} for price, volume in order_book_state.get('depth', {}).get('asks', [])]
-                
-                # Create order book data in frontend format
-                order_book_data = {
-                    'bids': bids,
-                    'asks': asks,
-                    'best_bid': order_book_state.get('best_bid', 0.0),
-                    'best_ask': order_book_state.get('best_ask', 0.0),
-                    'mid_price': order_book_state.get('mid_price', 0.0),
-                    'spread': order_book_state.get('spread', 0.0)
-                }
-                
-                # Get strategy performance
-                strategy_performance = {}
-                for strategy_name in self.simulation.strategies:
-                    strategy_performance[strategy_name] = \
-                        self.simulation.get_strategy_performance(strategy_name)
-                
-                # Debug: Log strategy performance being sent
-                self.log_info(f"WebSocket sending performance for {len(strategy_performance)} strategies: {list(strategy_performance.keys())}")
-                
-                # Send current market state
-                market_data = {
-                    'order_book': order_book_data,
-                    'price_history': {
-                        'prices': prices,  # Last 100 prices
-                        'times': times
-                    },
-                    'trade_history': trade_history,  # Last 50 trades
-                    'simulation_time': self.simulation.current_time,
-                    'strategy_performance': strategy_performance
-                }
-                emit('market_update', market_data)
+                emit('market_update', self._build_market_snapshot())
     
     def _run_simulation_loop(self) -> None:
-        """Run the simulation loop in background thread."""
+        """Run the simulation loop as a background task."""
         try:
             self.log_info("Simulation loop started")
+            wall_start = time.monotonic()
+            sim_start = self.simulation.current_time
+            last_emit = dict.fromkeys(CHANNEL_INTERVALS, wall_start)
             
             while self.is_running and self.simulation:
-                # Run simulation for a short time - process more events
-                self.simulation.run_step(max_events=20)
+                # Advance simulated time only as far as the wall clock allows
+                target_time = sim_start + (time.monotonic() - wall_start) * SIMULATION_SPEED
+                if self.simulation.current_time < target_time:
+                    self.simulation.run_step(max_events=20)
+                
+                if len(self.simulation.order_events) > WEB_HISTORY_LIMIT:
+                    self._trim_history()
                 
-                # Don't automatically broadcast updates - let frontend request them
-                time.sleep(0.005)  # Smaller delay for more frequent updates
+                # Push each channel to clients on its own throttle
+                now = time.monotonic()
+                due = [channel for channel, interval in CHANNEL_INTERVALS.items()
+                       if now - last_emit[channel] >= interval * self.refresh_rate]
+                if due:
+                    self._broadcast_market_update(due)
+                    for channel in due:
+                        last_emit[channel] = now
+                
+                # Yield so the server can flush socket frames
+                self.socketio.sleep(LOOP_SLEEP)
                 
         except Exception as e:
             self.log_exception(f"Error in simulation loop: {e}")
             self.is_running = False
     
-    def _broadcast_market_update(self) -> None:
-        """Broadcast market update to all connected clients."""
+    def _trim_history(self) -> None:
+        """Drop the oldest half of the session's history, keeping broadcast offsets aligned."""
+        trades, price_history = self.simulation.trades, self.simulation.price_history
+        num_trades, num_prices = len(trades), len(price_history)
+        
+        self.simulation.trim_history(WEB_HISTORY_LIMIT // 2)
+        
+        last = self._last_emit
+        last['trade_idx'] = max(0, last['trade_idx'] - (num_trades - len(trades)))
+        last['price_idx'] = max(0, last['price_idx'] - (num_prices - len(price_history)))
+    
+    @staticmethod
+    def _format_prices(price_history, start: int) -> Dict[str, list]:
+        """Extract mid prices and times from ``start`` onwards."""
+        return {
+            'prices': price_history.column('mid_price')[start:].tolist(),
+            'times': price_history.column('timestamp')[start:].tolist()
+        }
+    
+    @staticmethod
+    def _format_order_book(order_book_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert order book state to the frontend format."""
+        # Convert depth format from (price, volume) tuples to {price, quantity} objects
+        depth = order_book_state.get('depth', {})
+        return {
+            'bids': [{'price': price, 'quantity': volume} for price, volume in depth.get('bids', [])],
+            'asks': [{'price': price, 'quantity': volume} for price, volume in depth.get('asks', [])],
+            'best_bid': order_book_state.get('best_bid', 0.0),
+            'best_ask': order_book_state.get('best_ask', 0.0),
+            'mid_price': order_book_state.get('mid_price', 0.0),
+            'spread': order_book_state.get('spread', 0.0)
+        }
+    
+    def _build_market_snapshot(self) -> Dict[str, Any]:
+        """Build the full market state sent to newly connected clients."""
+        recent_prices = self.simulation.recent_prices
+        return {
+            'order_book': self._format_order_book(self.simulation.get_orderbook_snapshot()),
+            'price_history': {
+                'prices': [price for _, price in recent_prices],
+                'times': [timestamp for timestamp, _ in recent_prices]
+            },
+            'trade_history': [trade.process() for trade in self.simulation.recent_trades],
+            'simulation_time': self.simulation.current_time,
+            'strategy_performance': self.simulation.get_all_strategy_performance()
+        }
+    
+    def _build_order_book_delta(self) -> Optional[Dict[str, Any]]:
+        """Build the order book update, or None if its visible depth is unchanged."""
+        order_book_state = self.simulation.get_orderbook_snapshot()
+        if order_book_state['depth'] == self._last_emit['depth']:
+            return None
+        self._last_emit['depth'] = order_book_state['depth']
+        return self._format_order_book(order_book_state)
+    
+    def _build_trade_delta(self) -> Dict[str, Any]:
+        """Build the prices and trades recorded since the previous broadcast."""
+        last = self._last_emit
+        trades = self.simulation.trades
+        price_history = self.simulation.price_history
+        
+        # Only the tail fits in the client windows, so never send more than that
+        trade_start = max(last['trade_idx'], len(trades) - 50)
+        price_start = max(last['price_idx'], len(price_history) - 100)
+        
+        delta = {
+            'price_history': self._format_prices(price_history, price_start),
+            'trade_history': trades.rows(trade_start),
+            'simulation_time': self.simulation.current_time
+        }
+        
+        last['trade_idx'] = len(trades)
+        last['price_idx'] = len(price_history)
+        return delta
+    
+    def _build_strategy_update(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Build the strategy performance update, or None if nothing changed."""
+        # The simulation returns the same cached dict until a strategy changes
+        performance = self.simulation.get_all_strategy_performance()
+        if performance is self._last_emit['strategy']:
+            return None
+        self._last_emit['strategy'] = performance
+        return performance
+    
+    def _reset_delta_state(self) -> None:
+        """Forget what has been broadcast so the next delta starts fresh."""
+        self._last_emit = {'trade_idx': 0, 'price_idx': 0, 'depth': None, 'strategy': None}
+        self._next_debug_time = 0.0
+    
+    def _broadcast_market_update(self, channels=CHANNEL_INTERVALS) -> None:
+        """Broadcast market changes on the given channels to all connected clients."""
         try:
             if not self.simulation:
                 self.log_info("No simulation running, skipping broadcast")
                 return
             
-            # Convert trade events to dictionaries for JSON serialization
-            trade_history = []
-            for trade in self.simulation.trades[-50:]:
-                if hasattr(trade, 'process'):
-                    trade_history.append(trade.process())
-                else:
-                    # Fallback for non-event objects
-                    trade_history.append({
-                        'trade_id': getattr(trade, 'trade_id', 'unknown'),
-                        'price': getattr(trade, 'price', 0.0),
-                        'quantity': getattr(trade, 'quantity', 0),
-                        'timestamp': getattr(trade, 'timestamp', 0.0)
-                    })
-            
-            # Extract price data from price_history
-            price_data = self.simulation.price_history[-100:] if self.simulation.price_history else []
-            prices = [entry.get('mid_price', 100.0) for entry in price_data]
-            times = [entry.get('timestamp', 0.0) for entry in price_data]
-            
-            # Add some debugging
-            self.log_info(f"Price history: {len(self.simulation.price_history)} entries, sending {len(prices)} prices")
-            if prices:
-                self.log_info(f"Price range: {min(prices):.2f} - {max(prices):.2f}")
-            else:
-                self.log_info("No price data available")
+            # Pre-encoded bytes go out as binary frames, skipping Socket.IO's text encoding
+            if 'order_book' in channels:
+                order_book = self._build_order_book_delta()
+                if order_book is not None:
+                    self.socketio.emit('order_book_delta', serialization.dumps_bytes(order_book))
             
-            # Get order book state and convert to frontend format
-            order_book_state = self.simulation.order_book.get_state()
-            
-            # Convert depth format from (price, volume) tuples to {price, quantity} objects
-            bids = [{'price': price, 'quantity': volume} for price, volume in order_book_state.get('depth', {}).get('bids', [])]
-            asks = [{'price': price, 'quantity': volume} for price, volume in order_book_state.get('depth', {}).get('asks', [])]
-            
-            # Create order book data in frontend format
-            order_book_data = {
-                'bids': bids,
-                'asks': asks,
-                'best_bid': order_book_state.get('best_bid', 0.0),
-                'best_ask': order_book_state.get('best_ask', 0.0),
-                'mid_price': order_book_state.get('mid_price', 0.0),
-                'spread': order_book_state.get('spread', 0.0)
-            }
-            
-            # Add debugging for order book
-            self.log_info(f"Order book: {len(bids)} bids, {len(asks)} asks")
-            if bids:
-                self.log_info(f"Best bid: {bids[0]['price']:.2f} @ {bids[0]['quantity']}")
-            if asks:
-                self.log_info(f"Best ask: {asks[0]['price']:.2f} @ {asks[0]['quantity']}")
-            
-            market_data = {
-                'order_book': order_book_data,
-                'price_history': {
-                    'prices': prices,
-                    'times': times
-                },
-                'trade_history': trade_history,
-                'simulation_time': self.simulation.current_time,
-                'strategy_performance': {}
-            }
-            
-            # Add strategy performance
-            for strategy_name in self.simulation.strategies:
-                market_data['strategy_performance'][strategy_name] = \
-                    self.simulation.get_strategy_performance(strategy_name)
+            if 'trades' in channels:
+                delta = self._build_trade_delta()
+                self.socketio.emit('trade_delta', serialization.dumps_bytes(delta))
+                
+                # Periodic debug output, throttled in simulated time
+                current_time = self.simulation.current_time
+                if current_time >= self._next_debug_time and self.logger.isEnabledFor(logging.DEBUG):
+                    self.log_debug(f"Broadcasting trade delta at t={current_time:.1f}: "
+                                   f"{len(delta['price_history']['prices'])} prices, "
+                                   f"{len(delta['trade_history'])} trades")
+                    self._next_debug_time = current_time + DEBUG_LOG_INTERVAL
             
-            self.log_info(f"Broadcasting market update: {len(prices)} prices, {len(trade_history)} trades")
-            self.socketio.emit('market_update', market_data)
+            if 'strategy' in channels:
+                performance = self._build_strategy_update()
+                if performance is not None:
+                    self.socketio.emit('strategy_update', serialization.dumps_bytes(performance))
             
         except Exception as e:
             self.log_exception(f"Error broadcasting market update: {e}")
@@ -46,6 +46,12 @@ setup(
             "flask>=2.0.0",
             "flask-socketio>=5.0.0",
         ],
+        "parquet": [
+            "pyarrow>=8.0.0",
+        ],
+        "zstd": [
+            "zstandard>=0.18.0",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -25,6 +25,15 @@ const Utils = {
         }).format(num);
     },
     
+    // Binary frames carry UTF-8 JSON; plain objects are passed through
+    frameDecoder: new TextDecoder(),
+    decodeFrame: (payload) => {
+        if (payload instanceof ArrayBuffer || ArrayBuffer.isView(payload)) {
+            return JSON.parse(Utils.frameDecoder.decode(payload));
+        }
+        return payload;
+    },
+    
     showNotification: (message, type = 'info') => {
         const notification = document.createElement('div');
         notification.className = `notification ${type}`;
@@ -54,7 +63,6 @@ const Utils = {
 // WebSocket management
 const WebSocketManager = {
     refreshRate: 1.0,
-    updateInterval: null,
     
     connect: () => {
         // Connect to the same port as the current page
@@ -68,8 +76,8 @@ const WebSocketManager = {
             Utils.showNotification('Connected to server', 'success');
             UI.updateConnectionStatus(true);
             
-            // Start requesting updates at the current refresh rate
-            WebSocketManager.startUpdateRequests();
+            // The server pushes updates at our refresh rate
+            WebSocketManager.sendRefreshRate();
             
             // Request initial update immediately
             setTimeout(() => {
@@ -81,7 +89,6 @@ const WebSocketManager = {
             AppState.isConnected = false;
             Utils.showNotification('Disconnected from server', 'error');
             UI.updateConnectionStatus(false);
-            WebSocketManager.stopUpdateRequests();
         });
         
         AppState.socket.on('market_update', (data) => {
@@ -92,6 +99,24 @@ const WebSocketManager = {
             UI.updateStrategyPerformance(data.strategy_performance || {});
         });
         
+        // Each channel is throttled independently on the server
+        AppState.socket.on('trade_delta', (payload) => {
+            DataManager.applyMarketDelta(Utils.decodeFrame(payload));
+            UI.updateCharts();
+        });
+        
+        AppState.socket.on('order_book_delta', (payload) => {
+            const orderBook = Utils.decodeFrame(payload);
+            DataManager.marketData.orderBook = orderBook;
+            UI.updateOrderBook(orderBook);
+        });
+        
+        AppState.socket.on('strategy_update', (payload) => {
+            const performance = Utils.decodeFrame(payload);
+            DataManager.marketData.strategyPerformance = performance;
+            UI.updateStrategyPerformance(performance);
+        });
+        
         AppState.socket.on('connected', (data) => {
             console.log('Socket connected:', data);
         });
@@ -102,7 +127,6 @@ const WebSocketManager = {
             AppState.socket.disconnect();
             AppState.socket = null;
         }
-        WebSocketManager.stopUpdateRequests();
     },
     
     requestUpdate: () => {
@@ -112,37 +136,24 @@ const WebSocketManager = {
         }
     },
     
-    startUpdateRequests: () => {
-        WebSocketManager.stopUpdateRequests(); // Clear any existing interval
-        
-        WebSocketManager.updateInterval = setInterval(() => {
-            if (AppState.isConnected && AppState.socket) {
-                WebSocketManager.requestUpdate();
-            }
-        }, WebSocketManager.refreshRate * 1000);
-        
-        console.log(`Started update requests every ${WebSocketManager.refreshRate} seconds`);
-    },
-    
-    stopUpdateRequests: () => {
-        if (WebSocketManager.updateInterval) {
-            clearInterval(WebSocketManager.updateInterval);
-            WebSocketManager.updateInterval = null;
-            console.log('Stopped update requests');
+    sendRefreshRate: () => {
+        if (AppState.socket && AppState.isConnected) {
+            AppState.socket.emit('set_refresh_rate', { refresh_rate: WebSocketManager.refreshRate });
         }
     },
     
     updateRefreshRate: (newRate) => {
         console.log(`WebSocket refresh rate changed from ${WebSocketManager.refreshRate}s to ${newRate}s`);
         WebSocketManager.refreshRate = newRate;
-        if (AppState.isConnected) {
-            WebSocketManager.startUpdateRequests();
-        }
+        WebSocketManager.sendRefreshRate();
     }
 };
 
 // Data management
 const DataManager = {
+    maxPrices: 100,
+    maxTrades: 50,
+    
     marketData: {
         orderBook: {},
         priceHistory: { prices: [], times: [] },
@@ -168,6 +179,45 @@ const DataManager = {
         DataManager.marketData = { ...DataManager.marketData, ...data };
     },
     
+    applyMarketDelta: (delta) => {
+        const data = DataManager.marketData;
+        
+        // Append new price ticks, skipping any already covered by the snapshot
+        const history = data.priceHistory || { prices: [], times: [] };
+        const lastTime = history.times.length > 0 ? history.times[history.times.length - 1] : -Infinity;
+        const newTimes = delta.price_history ? delta.price_history.times : [];
+        const newPrices = delta.price_history ? delta.price_history.prices : [];
+        const times = history.times.slice();
+        const prices = history.prices.slice();
+        newTimes.forEach((t, i) => {
+            if (t > lastTime) {
+                times.push(t);
+                prices.push(newPrices[i]);
+            }
+        });
+        data.priceHistory = {
+            prices: prices.slice(-DataManager.maxPrices),
+            times: times.slice(-DataManager.maxPrices)
+        };
+        
+        // Append new trades, keeping the most recent window
+        const seen = new Set((data.tradeHistory || []).map(trade => trade.trade_id));
+        const trades = (data.tradeHistory || []).concat(
+            (delta.trade_history || []).filter(trade => !seen.has(trade.trade_id))
+        );
+        data.tradeHistory = trades.slice(-DataManager.maxTrades);
+        
+        if (delta.order_book) {
+            data.orderBook = delta.order_book;
+        }
+        if (delta.strategy_performance) {
+            data.strategyPerformance = delta.strategy_performance;
+        }
+        if (delta.simulation_time !== undefined) {
+            data.simulation_time = delta.simulation_time;
+        }
+    },
+    
     getLatestPrice: () => {
         const prices = DataManager.marketData.priceHistory.prices;
         return prices.length > 0 ? prices[prices.length - 1] : 0;
@@ -7,6 +7,8 @@ This module contains comprehensive tests for all simulation components.
 import unittest
 import sys
 import os
+from unittest import mock
+from dataclasses import replace
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import numpy as np
@@ -16,6 +18,7 @@ from lob_simulation.core.simulation import LimitOrderBookSimulation, SimulationC
 from lob_simulation.orderbook import OrderBook
 from lob_simulation.events import OrderEvent, CancelEvent, TradeEvent
 from lob_simulation.agents import InformedTrader, UninformedTrader, MarketMaker
+from lob_simulation.strategies import StrategyConfig
 
 
 class TestSimulationConfig(unittest.TestCase):
@@ -257,6 +260,59 @@ class TestAgents(unittest.TestCase):
         
         self.assertEqual(trader.inventory, 25)
         self.assertEqual(trader.cash, 100000.0 - 100.0 * 50 + 101.0 * 25)
+    
+    def test_agent_batch_pnl_update(self):
+        """Test that a batched P&L update matches per-trade updates."""
+        trades = [(100.0, 50, "buy"), (101.0, 25, "sell"), (99.5, 10, "buy")]
+        single = InformedTrader("single", 0.1)
+        batch = InformedTrader("batch", 0.1)
+        
+        for price, quantity, side in trades:
+            single.update_pnl(price, quantity, side)
+        batch.update_pnl_batch(*zip(*trades))
+        
+        self.assertEqual(batch.inventory, single.inventory)
+        self.assertAlmostEqual(batch.cash, single.cash)
+        self.assertAlmostEqual(batch.pnl, single.pnl)
+    
+    def test_agent_order_ids_are_unique(self):
+        """Test that consecutive orders from one agent get distinct ids."""
+        trader = UninformedTrader("uninformed_1", 0.5)
+        
+        order_ids = [trader.get_next_event(0.0).order_id for _ in range(100)]
+        
+        self.assertEqual(len(set(order_ids)), 100)
+        self.assertTrue(all(oid.startswith("uninformed_1_order_") for oid in order_ids))
+    
+    def test_seeded_agents_are_reproducible(self):
+        """Test that agents built with the same seed generate the same orders."""
+        first = InformedTrader("informed_1", 0.1, seed=7)
+        second = InformedTrader("informed_1", 0.1, seed=7)
+        
+        for _ in range(20):
+            a = first.get_next_event(0.0).process()
+            b = second.get_next_event(0.0).process()
+            self.assertEqual(a, b)
+    
+    def test_market_maker_cancels_oldest_stale_quote(self):
+        """Test that stale quotes are cancelled oldest first."""
+        mm = MarketMaker("mm_1", 0.2, seed=3)
+        first = mm.get_next_event(0.0)
+        mm.get_next_event(first.timestamp)
+        
+        self.assertIsNone(mm.cancel_stale_orders(first.timestamp + 1.0))
+        
+        cancel = mm.cancel_stale_orders(first.timestamp + 61.0)
+        self.assertEqual(cancel.order_id, first.order_id)
+    
+    def test_market_maker_sends_stale_cancel_as_next_event(self):
+        """Test that a market maker pulls a stale quote instead of quoting again."""
+        mm = MarketMaker("mm_1", 0.2, seed=3)
+        first = mm.get_next_event(0.0)
+        
+        event = mm.get_next_event(first.timestamp + 61.0)
+        self.assertIsInstance(event, CancelEvent)
+        self.assertEqual(event.order_id, first.order_id)
 
 
 class TestSimulation(unittest.TestCase):
@@ -308,6 +364,16 @@ class TestSimulation(unittest.TestCase):
         self.assertIn('spread', snapshot)
         self.assertIn('depth', snapshot)
     
+    def test_orderbook_snapshot_tracks_book_changes(self):
+        """Test that the cached snapshot is refreshed when the book changes."""
+        self.assertEqual(self.simulation.get_orderbook_snapshot()['num_orders'], 0)
+        
+        self.simulation.orderbook.add_order(OrderEvent("snap_1", "trader_1", "buy", 99.0, 10, 0.0))
+        
+        snapshot = self.simulation.get_orderbook_snapshot()
+        self.assertEqual(snapshot['num_orders'], 1)
+        self.assertEqual(snapshot['best_bid'], 99.0)
+        
     def test_custom_event_addition(self):
         """Test adding custom events to simulation."""
         order_event = OrderEvent(
@@ -323,9 +389,79 @@ class TestSimulation(unittest.TestCase):
         
         # Check that event was added to queue
         self.assertEqual(len(self.simulation.event_queue), 1)
-        event_time, event = self.simulation.event_queue[0]
+        event_time, _, event = self.simulation.event_queue[0]
         self.assertEqual(event_time, 1.0)
         self.assertEqual(event.order_id, "custom_order")
+    
+    def test_filled_agent_orders_are_settled(self):
+        """Test that fills update both agents and close the filled quote."""
+        mm = self.simulation.agents['market_makers'][0]
+        quote = mm.get_next_event(0.0)
+        self.simulation._process_event(quote)
+        self.assertIn(quote.order_id, self.simulation._resting_orders)
+        
+        taker_side = "sell" if quote.side == "buy" else "buy"
+        taker_price = 0.01 if taker_side == "sell" else 1000.0
+        self.simulation._process_event(
+            OrderEvent("taker", "custom_trader", taker_side, taker_price, quote.quantity, 1.0)
+        )
+        
+        signed = quote.quantity if quote.side == "buy" else -quote.quantity
+        self.assertEqual(mm.inventory, signed)
+        self.assertNotIn(quote.order_id, self.simulation._resting_orders)
+        self.assertNotIn(quote.order_id, mm._buy_orders)
+        self.assertNotIn(quote.order_id, mm._sell_orders)
+    
+    def test_trim_history_keeps_newest_records(self):
+        """Test that trimming drops the oldest records and keeps trade ids unique."""
+        self.simulation.reset()
+        self.simulation._schedule_initial_events()
+        self.simulation.run_step(max_events=200)
+        num_trades = self.simulation.orderbook.trade_count
+        last_price_time = self.simulation.price_history.column('timestamp')[-1]
+        
+        self.simulation.trim_history(5)
+        
+        self.assertEqual(len(self.simulation.order_events), 5)
+        self.assertLessEqual(len(self.simulation.trades), 5)
+        self.assertLessEqual(len(self.simulation.orderbook.trades), 5)
+        self.assertEqual(self.simulation.price_history.column('timestamp')[-1], last_price_time)
+        self.assertEqual(self.simulation.get_orderbook_snapshot()['num_trades'], num_trades)
+        
+        trades = self.simulation.orderbook.add_order(OrderEvent("trim_bid", "trader_1", "buy", 1000.0, 10, 0.0))
+        trades += self.simulation.orderbook.add_order(OrderEvent("trim_ask", "trader_2", "sell", 0.01, 10, 0.0))
+        self.assertEqual(trades[0].trade_id, f"trade_{num_trades}")
+    
+    def test_trade_history_columns(self):
+        """Test that trades are stored as columns but still read back as events."""
+        trade = TradeEvent("trade_1", "buy_1", "sell_1", 100.5, 20, 2.0)
+        self.simulation.trades.append(trade)
+        
+        self.assertEqual(len(self.simulation.trades), 1)
+        self.assertEqual(self.simulation.trades.column('price').tolist(), [100.5])
+        self.assertIsInstance(self.simulation.trades[-1], TradeEvent)
+        self.assertEqual(self.simulation.trades[-1].trade_id, "trade_1")
+        self.assertEqual(self.simulation.trades.rows()[0]['quantity'], 20)
+    
+    def test_market_state_is_sampled_at_record_interval(self):
+        """Test that market state snapshots are at least one record interval apart."""
+        self.simulation.run(duration=10.0)
+        
+        timestamps = self.simulation.price_history.column('timestamp')
+        self.assertGreater(len(timestamps), 0)
+        self.assertTrue((np.diff(timestamps) >= self.config.record_interval - 1e-9).all())
+    
+    def test_strategy_orders_generated_on_recurring_tick(self):
+        """Test that strategies are asked for orders exactly once per tick interval."""
+        self.simulation = LimitOrderBookSimulation(replace(self.config, random_seed=42))
+        self.simulation.add_strategy('market_making', StrategyConfig(strategy_name='market_making'))
+        strategy = self.simulation.strategies['market_making']
+        
+        with mock.patch.object(strategy, 'generate_orders', return_value=[]) as generate_orders:
+            self.simulation.run(duration=12.0)
+        
+        order_times = [call.args[0] for call in generate_orders.call_args_list]
+        self.assertEqual(order_times, [0.1, 5.1, 10.1])
 
 
 class TestIntegration(unittest.TestCase):
@@ -354,6 +490,8 @@ class TestIntegration(unittest.TestCase):
         self.assertIn('spread_history', results)
         self.assertIn('volume_history', results)
         self.assertIn('orderbook_state', results)
+        self.assertIs(results.trades, results['trades'])
+        self.assertEqual(results.config['duration'], 10.0)
         
         # Check that simulation completed
         self.assertGreaterEqual(simulation.current_time, 10.0)
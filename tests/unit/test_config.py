@@ -6,6 +6,7 @@ import unittest
 import tempfile
 import json
 import os
+from dataclasses import FrozenInstanceError
 from unittest.mock import patch
 
 from config.settings import (
@@ -100,8 +101,8 @@ class TestConfigManager(unittest.TestCase):
         
         try:
             # Modify some values
-            self.config.simulation.initial_price = 150.0
-            self.config.agent.market_maker_count = 5
+            self.config.update_config('simulation', initial_price=150.0)
+            self.config.update_config('agent', market_maker_count=5)
             
             # Save configuration
             self.config.save_to_file(config_file)
@@ -147,6 +148,14 @@ class TestConfigManager(unittest.TestCase):
         self.assertEqual(self.config.agent.market_maker_count, 7)
         self.assertEqual(self.config.agent.initial_capital, 300000.0)
     
+    def test_config_sections_are_frozen(self):
+        """Test that config sections can only change through update_config."""
+        with self.assertRaises(FrozenInstanceError):
+            self.config.simulation.initial_price = 200.0
+        
+        self.config.update_config('simulation', initial_price=200.0, unknown_key=1)
+        self.assertEqual(self.config.simulation.initial_price, 200.0)
+    
     def test_load_nonexistent_file(self):
         """Test loading configuration from nonexistent file."""
         config = ConfigManager('nonexistent_file.json')